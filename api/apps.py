@@ -7,3 +7,12 @@ class ApiConfig(AppConfig):
 
     def ready(self):
         import api.signals
+
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+
+        from .instrumentation import install_drf_hooks, instrument_connection
+
+        if settings.REQUEST_METRICS:
+            install_drf_hooks()
+            connection_created.connect(instrument_connection)
@@ -0,0 +1,273 @@
+"""
+Async versions of the hot read endpoints, served when ``ASYNC_VIEWS`` is on
+(the default under ``api_task.asgi``). Each view subclasses its sync
+counterpart and only overrides the GET handlers; writes still run the sync
+handlers, in a thread.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db.models import Prefetch
+from django.http import Http404
+from django.utils.functional import classproperty
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Notification, Project, Task, Timeline
+from .response_cache import (
+    NOTIFICATIONS,
+    PROJECT,
+    PROJECTS,
+    TASK,
+    TASKS,
+    TIMELINE,
+    cache_response,
+    url_object_scope,
+    user_scope,
+)
+from .serializers import (
+    TaskSerializer,
+    UserSerializer,
+    notification_values_serializer,
+    task_values_serializer,
+    timeline_values_serializer,
+)
+from .views import (
+    CreateTimelineAPIView,
+    NotificationModelViewSet,
+    ProjectModelViewSet,
+    TaskModelViewSet,
+    UserModelViewSet,
+)
+
+User = get_user_model()
+
+
+class AsyncAPIViewMixin:
+    """
+    Runs ``APIView.dispatch`` on the event loop. Async handlers are awaited
+    directly; sync ones, and the authentication and permission checks, which
+    may query the database, run through ``sync_to_async``.
+    """
+
+    @classproperty
+    def view_is_async(cls):
+        return True
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        # ViewSetMixin.as_view builds its own view function, unmarked.
+        if not iscoroutinefunction(view):
+            markcoroutinefunction(view)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            method = request.method.lower()
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aget_object(self, queryset=None):
+        """Async version of ``GenericAPIView.get_object``."""
+        if queryset is None:
+            queryset = self.get_queryset()
+        queryset = self.filter_queryset(queryset)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class AsyncProjectModelViewSet(AsyncAPIViewMixin, ProjectModelViewSet):
+    # Prefetched up front: the serializer can't load them lazily on the loop.
+    projects = Project.objects.prefetch_related(
+        Prefetch("team_members", queryset=User.objects.only("id"))
+    )
+
+    @cache_response(user_scope(PROJECTS))
+    async def list(self, request, *args, **kwargs):
+        try:
+            projects = self.projects.filter(team_members__id=request.user.id)
+            page = await self.paginator.apaginate_queryset(projects, request, self)
+            serializer = self.serializer_class(page, many=True)
+            if serializer.data != []:
+                return Response(
+                    self.paginator.get_paginated_envelope("projects", serializer.data),
+                    status=status.HTTP_200_OK,
+                )
+            return Response(
+                {"status_code": 404, "message": "No project found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    @cache_response(url_object_scope(PROJECT, "pk"))
+    async def retrieve(self, request, *args, **kwargs):
+        try:
+            project = await self.aget_object(self.projects.all())
+            serializer = self.serializer_class(project)
+            return Response(
+                {"status_code": 200, "project": serializer.data},
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class AsyncTaskModelViewSet(AsyncAPIViewMixin, TaskModelViewSet):
+    @cache_response(user_scope(TASKS))
+    async def list(self, request, *args, **kwargs):
+        try:
+            tasks = Task.objects.filter(assignee_id=request.user.id)
+            page = await self.paginator.apaginate_queryset(
+                task_values_serializer.values(tasks), request, self
+            )
+            if page:
+                return Response(
+                    self.paginator.get_paginated_envelope(
+                        "tasks", task_values_serializer.serialize(page)
+                    ),
+                    status=status.HTTP_200_OK,
+                )
+            return Response(
+                {"status_code": 404, "message": "No task found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    @cache_response(url_object_scope(TASK, "pk"))
+    async def retrieve(self, request, *args, **kwargs):
+        try:
+            task = await self.aget_object()
+            serializer = TaskSerializer(task)
+            return Response(
+                {"status_code": 200, "task": serializer.data}, status=status.HTTP_200_OK
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class AsyncCreateTimelineAPIView(AsyncAPIViewMixin, CreateTimelineAPIView):
+    @cache_response(url_object_scope(TIMELINE, "id"))
+    async def get(self, request, *args, **kwargs):
+        try:
+            timelines = Timeline.objects.filter(project__id=kwargs["id"])
+            paginator = self.pagination_class()
+            page = await paginator.apaginate_queryset(
+                timeline_values_serializer.values(timelines), request, view=self
+            )
+            if page:
+                return Response(
+                    paginator.get_paginated_envelope(
+                        "timelines", timeline_values_serializer.serialize(page)
+                    ),
+                    status=status.HTTP_200_OK,
+                )
+            return Response(
+                {"status_code": 404, "message": "No timeline found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class AsyncNotificationModelViewSet(AsyncAPIViewMixin, NotificationModelViewSet):
+    @cache_response(user_scope(NOTIFICATIONS))
+    async def list(self, request, *args, **kwargs):
+        try:
+            notifications = Notification.objects.filter(
+                user__id=request.user.id, mark_read=False
+            )
+            page = await self.paginator.apaginate_queryset(
+                notification_values_serializer.values(notifications), request, self
+            )
+            if page:
+                return Response(
+                    self.paginator.get_paginated_envelope(
+                        "notifications", notification_values_serializer.serialize(page)
+                    ),
+                    status=status.HTTP_200_OK,
+                )
+            return Response(
+                {"status_code": 404, "message": "No notification found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class AsyncUserModelViewSet(AsyncAPIViewMixin, UserModelViewSet):
+    async def get(self, request, *args, **kwargs):
+        try:
+            # Reload with the profile joined; lazy loads can't run on the loop.
+            user = (
+                await User.objects.select_related("user_profile")
+                .filter(pk=request.user.pk)
+                .afirst()
+            )
+            if user:
+                serializer = UserSerializer(user)
+                return Response(
+                    {
+                        "status_code": 200,
+                        "message": "User found",
+                        "user": serializer.data,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+            return Response(
+                {"status_code": 404, "message": "No user found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+
+class LazyTokenUser:
+    """
+    Authenticated user built from the claims of a validated access token.
+
+    ``id``/``pk`` come straight from the token, so views that only need the
+    user's ID never query the database. Any other attribute loads the full
+    ``UserModel`` row once and is read from it.
+    """
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        self.token = token
+
+    def __str__(self):
+        return str(self._user)
+
+    @cached_property
+    def id(self):
+        return self.token[api_settings.USER_ID_CLAIM]
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def _user(self):
+        return User.objects.get(**{api_settings.USER_ID_FIELD: self.id})
+
+    def __getattr__(self, name):
+        # Only called for attributes missing above; never proxy private names
+        # so copying/pickling doesn't load the user.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._user, name)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyTokenUser):
+            return self.id == other.id
+        if isinstance(other, User):
+            return self.id == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the per-request user lookup, returning a
+    ``LazyTokenUser`` instead. Users deactivated or deleted after the token was
+    issued keep access until it expires.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return LazyTokenUser(validated_token)
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class BlacklistCache:
+    """
+    Thread-safe LRU of ``jti -> blacklisted`` lookups, each entry expiring at
+    its own deadline (at the latest when the token itself expires).
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, jti):
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is None:
+                return None
+            blacklisted, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[jti]
+                return None
+            self._entries.move_to_end(jti)
+            return blacklisted
+
+    def set(self, jti, blacklisted, expires_at):
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[jti] = (blacklisted, expires_at)
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+blacklist_cache = BlacklistCache(getattr(settings, "TOKEN_BLACKLIST_CACHE_SIZE", 10000))
+
+
+def remember_blacklisted(jti, exp):
+    """Cache that the token ``jti``, expiring at epoch ``exp``, is blacklisted."""
+    blacklist_cache.set(jti, True, exp)
+
+
+class CachedRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist check is answered from ``blacklist_cache``
+    when possible.
+
+    A blacklisted token stays blacklisted, so positive results are kept until
+    the token expires. Negative results are only kept for
+    ``TOKEN_BLACKLIST_NEGATIVE_CACHE_TTL`` seconds (off by default): another
+    worker may blacklist the token meanwhile, and this process would keep
+    accepting it for that long. Deleting a ``BlacklistedToken`` row does not
+    evict cached positives; they expire with the token.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        blacklisted = blacklist_cache.get(jti)
+        if blacklisted is None:
+            blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+            if blacklisted:
+                remember_blacklisted(jti, self.payload["exp"])
+            else:
+                ttl = getattr(settings, "TOKEN_BLACKLIST_NEGATIVE_CACHE_TTL", 0)
+                if ttl > 0:
+                    expires_at = min(self.payload["exp"], time.time() + ttl)
+                    blacklist_cache.set(jti, False, expires_at)
+        if blacklisted:
+            raise TokenError(_("Token is blacklisted"))
@@ -0,0 +1,39 @@
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Notification, UserModel
+
+
+def adjust_unread_counts(deltas):
+    """
+    Add ``deltas[user_id]`` to each user's unread notification counter, with
+    one atomic ``UPDATE ... SET count = count + n`` per distinct delta.
+    Counters never drop below zero, so rows written without signals (e.g.
+    ``bulk_create``) only leave them stale until the next reconcile.
+    """
+    users_by_delta = defaultdict(list)
+    for user_id, delta in Counter(deltas).items():
+        if delta:
+            users_by_delta[delta].append(user_id)
+    for delta, user_ids in users_by_delta.items():
+        UserModel.objects.filter(id__in=user_ids).update(
+            unread_notification_count=Greatest(
+                F("unread_notification_count") + delta, 0
+            )
+        )
+
+
+def reconcile_unread_counts(user_ids):
+    """Recompute the unread counters of ``user_ids`` with a single UPDATE."""
+    unread = (
+        Notification.objects.filter(user_id=OuterRef("pk"), mark_read=False)
+        .order_by()
+        .values("user_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    return UserModel.objects.filter(id__in=user_ids).update(
+        unread_notification_count=Coalesce(Subquery(unread), 0)
+    )
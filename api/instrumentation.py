@@ -0,0 +1,305 @@
+"""
+Per-request query count and timing of the database, serializers and
+renderers, reported as ``Server-Timing`` headers and aggregated into per-route
+histograms (see ``RequestMetricsMiddleware`` and ``manage.py request_metrics``).
+"""
+
+import contextvars
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Upper bounds of the histogram buckets; the last bucket is unbounded.
+TIME_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+TIMINGS = ("total", "db", "serialize", "render")
+
+CACHE_PREFIX = "api:request_metrics:"
+PROCESSES_KEY = CACHE_PREFIX + "processes"
+SNAPSHOT_TIMEOUT = 24 * 60 * 60
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """What one request spent, in milliseconds, and how many queries it ran."""
+
+    def __init__(self):
+        self.queries = 0
+        # Queries run while serializing, the usual sign of an N+1.
+        self.serializer_queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.total = 0.0
+        self.started = time.perf_counter()
+        self._serializing = 0
+
+    def server_timing(self):
+        return ", ".join(
+            [
+                f'db;dur={self.db:.1f};desc="{self.queries} queries"',
+                f'serialize;dur={self.serialize:.1f};desc="'
+                f'{self.serializer_queries} queries"',
+                f"render;dur={self.render:.1f}",
+                f"total;dur={self.total:.1f}",
+            ]
+        )
+
+
+@contextmanager
+def collect():
+    """Collect the metrics of the code run in the block into a new object."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        metrics.total = (time.perf_counter() - metrics.started) * 1000
+        _current.reset(token)
+
+
+def collect_streaming(metrics, content, done):
+    """
+    Keep collecting into ``metrics`` while the server consumes the streaming
+    body ``content``, then call ``done()`` once it is exhausted or closed.
+    """
+    content = iter(content)
+    try:
+        while True:
+            # Only around next(): a context variable set across a yield
+            # would leak into the server code iterating the generator.
+            token = _current.set(metrics)
+            try:
+                chunk = next(content)
+            except StopIteration:
+                return
+            finally:
+                _current.reset(token)
+            yield chunk
+    finally:
+        metrics.total = (time.perf_counter() - metrics.started) * 1000
+        done()
+
+
+async def acollect_streaming(metrics, content, done):
+    """``collect_streaming`` for async bodies; ``done`` is awaited."""
+    content = aiter(content)
+    try:
+        while True:
+            token = _current.set(metrics)
+            try:
+                chunk = await anext(content)
+            except StopAsyncIteration:
+                return
+            finally:
+                _current.reset(token)
+            yield chunk
+    finally:
+        metrics.total = (time.perf_counter() - metrics.started) * 1000
+        await done()
+
+
+def record_query(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook timing queries of collected requests."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db += (time.perf_counter() - start) * 1000
+        metrics.queries += 1
+        if metrics._serializing:
+            metrics.serializer_queries += 1
+
+
+def instrument_connection(sender, connection, **kwargs):
+    # Installed once per connection, for its whole lifetime.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to ``phase`` of the current request."""
+    metrics = _current.get()
+    # ListSerializer.data calls Serializer.data; only time the outer one.
+    if metrics is None or (phase == "serialize" and metrics._serializing):
+        yield
+        return
+    if phase == "serialize":
+        metrics._serializing += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        setattr(metrics, phase, getattr(metrics, phase) + elapsed)
+        if phase == "serialize":
+            metrics._serializing -= 1
+
+
+def install_drf_hooks():
+    """
+    Time ``serializer.data`` and ``Response.rendered_content`` for every DRF
+    serializer and renderer, without touching the views.
+    """
+    from rest_framework.response import Response
+    from rest_framework.serializers import BaseSerializer
+
+    def timed_property(prop, phase):
+        def getter(self):
+            with timed(phase):
+                return prop.fget(self)
+
+        getter.__wrapped__ = prop.fget
+        return property(getter)
+
+    if not hasattr(BaseSerializer.data.fget, "__wrapped__"):
+        BaseSerializer.data = timed_property(BaseSerializer.data, "serialize")
+    if not hasattr(Response.rendered_content.fget, "__wrapped__"):
+        Response.rendered_content = timed_property(Response.rendered_content, "render")
+
+
+class Histogram:
+    def __init__(self, bounds, counts=None, total=0.0):
+        self.bounds = bounds
+        self.counts = counts or [0] * (len(bounds) + 1)
+        self.total = total
+
+    def add(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the ``p`` quantile."""
+        target = p * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            seen += count
+            if count and seen >= target:
+                return bound
+        return 0
+
+    def to_dict(self):
+        return {"counts": self.counts, "total": self.total}
+
+    @classmethod
+    def from_dict(cls, bounds, data):
+        return cls(bounds, list(data["counts"]), data["total"])
+
+
+class RouteMetrics:
+    """Histograms of every timing and of the query count of one route."""
+
+    def __init__(self):
+        self.histograms = {name: Histogram(TIME_BUCKETS_MS) for name in TIMINGS}
+        self.histograms["queries"] = Histogram(QUERY_BUCKETS)
+        self.histograms["serializer_queries"] = Histogram(QUERY_BUCKETS)
+
+    def add(self, metrics):
+        for name, histogram in self.histograms.items():
+            histogram.add(getattr(metrics, name))
+
+    def merge(self, other):
+        for name, histogram in self.histograms.items():
+            histogram.merge(other.histograms[name])
+
+    def to_dict(self):
+        return {name: h.to_dict() for name, h in self.histograms.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        route = cls()
+        for name, histogram in route.histograms.items():
+            if name in data:
+                route.histograms[name] = Histogram.from_dict(
+                    histogram.bounds, data[name]
+                )
+        return route
+
+
+class MetricsRegistry:
+    """
+    Per-process aggregate of request metrics by route. Snapshots are written
+    to the cache every ``REQUEST_METRICS_FLUSH_INTERVAL`` seconds, one key per
+    process, so ``load_metrics`` can merge every worker's histograms.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.lock = threading.Lock()
+        self.flushed_at = time.monotonic()
+
+    @property
+    def key(self):
+        # Looked up on use: workers may be forked after this module is imported.
+        return f"{CACHE_PREFIX}{socket.gethostname()}:{os.getpid()}"
+
+    def add(self, route, metrics, flush=True):
+        """
+        Add a request's metrics to its route. Returns whether a flush was
+        due; it is left to the caller with ``flush=False``, e.g. to run it
+        in a thread from async code.
+        """
+        with self.lock:
+            self.routes.setdefault(route, RouteMetrics()).add(metrics)
+            due = (
+                time.monotonic() - self.flushed_at
+                >= settings.REQUEST_METRICS_FLUSH_INTERVAL
+            )
+            if due:
+                self.flushed_at = time.monotonic()
+        if due and flush:
+            self.flush()
+        return due
+
+    def flush(self):
+        with self.lock:
+            snapshot = {route: m.to_dict() for route, m in self.routes.items()}
+        cache.set(self.key, snapshot, SNAPSHOT_TIMEOUT)
+        processes = cache.get(PROCESSES_KEY) or []
+        if self.key not in processes:
+            cache.set(PROCESSES_KEY, processes + [self.key], SNAPSHOT_TIMEOUT)
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+
+
+registry = MetricsRegistry()
+
+
+def load_metrics():
+    """Merge the snapshots of every process into ``{route: RouteMetrics}``."""
+    processes = cache.get(PROCESSES_KEY) or []
+    merged = {}
+    for snapshot in cache.get_many(processes).values():
+        for route, data in snapshot.items():
+            merged.setdefault(route, RouteMetrics()).merge(RouteMetrics.from_dict(data))
+    return merged
+
+
+def reset_metrics():
+    cache.delete_many((cache.get(PROCESSES_KEY) or []) + [PROCESSES_KEY])
+    registry.reset()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from ...counters import reconcile_unread_counts
+from ...models import UserModel
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every user's unread notification counter from the "
+        "notification rows, one batch of users per UPDATE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, batch_size, **options):
+        users = UserModel.objects.order_by("id").values_list("id", flat=True)
+        last_id = 0
+        total = 0
+        while True:
+            ids = list(users.filter(id__gt=last_id)[:batch_size])
+            if not ids:
+                break
+            total += reconcile_unread_counts(ids)
+            last_id = ids[-1]
+        self.stdout.write(f"Reconciled {total} unread notification counters")
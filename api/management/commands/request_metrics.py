@@ -0,0 +1,68 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from ...instrumentation import load_metrics, reset_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Print per-route request histograms collected by "
+        "RequestMetricsMiddleware across all workers sharing the cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--json", action="store_true", help="Dump the raw histograms as JSON."
+        )
+        parser.add_argument(
+            "--sort",
+            choices=("requests", "total", "db", "queries"),
+            default="total",
+            help="Sort routes by request count, or by p95 of a measurement.",
+        )
+        parser.add_argument(
+            "--reset", action="store_true", help="Delete the collected metrics."
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            reset_metrics()
+            self.stdout.write("Request metrics reset")
+            return
+
+        routes = load_metrics()
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    {route: metrics.to_dict() for route, metrics in routes.items()},
+                    indent=2,
+                    sort_keys=True,
+                )
+            )
+            return
+        if not routes:
+            self.stdout.write("No request metrics collected yet")
+            return
+
+        def sort_key(item):
+            histograms = item[1].histograms
+            if options["sort"] == "requests":
+                return histograms["total"].count
+            return histograms[options["sort"]].percentile(0.95)
+
+        self.stdout.write(
+            f"{'route':<40} {'reqs':>7} {'p50ms':>7} {'p95ms':>7} {'p99ms':>7} "
+            f"{'db ms':>7} {'ser ms':>7} {'rnd ms':>7} {'queries':>8} {'ser q':>6}"
+        )
+        for route, metrics in sorted(routes.items(), key=sort_key, reverse=True):
+            h = metrics.histograms
+            # Queries issued while serializing usually mean a missing
+            # select_related/prefetch_related.
+            self.stdout.write(
+                f"{route:<40} {h['total'].count:>7} "
+                f"{h['total'].percentile(0.5):>7} {h['total'].percentile(0.95):>7} "
+                f"{h['total'].percentile(0.99):>7} {h['db'].mean():>7.1f} "
+                f"{h['serialize'].mean():>7.1f} {h['render'].mean():>7.1f} "
+                f"{h['queries'].mean():>8.1f} {h['serializer_queries'].mean():>6.1f}"
+            )
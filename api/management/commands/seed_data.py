@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...seeding import seed_dataset
+
+# Rows of each model at --scale 1; --scale 1000 is about 57M rows.
+VOLUMES = {
+    "users": 200,
+    "projects": 100,
+    "documents": 1000,
+    "tasks": 5000,
+    "comments": 10000,
+    "timeline": 20000,
+    "notifications": 20000,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with a synthetic dataset for profiling, inserted "
+        "in batches with bulk_create and without firing model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1,
+            help="Multiply the default volume of every model by this.",
+        )
+        for name, count in VOLUMES.items():
+            parser.add_argument(
+                f"--{name}",
+                type=int,
+                help=f"Number of {name} rows (default {count} x scale).",
+            )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--backfill-timeline",
+            action="store_true",
+            help="Also insert the 'created' timeline event of every project, "
+            "task and document, as the signals would have.",
+        )
+        parser.add_argument(
+            "--password",
+            default="password",
+            help="Password of every seeded user, hashed once.",
+        )
+
+    def handle(self, *args, scale, batch_size, **options):
+        counts = {
+            name: options[name] if options[name] is not None else int(count * scale)
+            for name, count in VOLUMES.items()
+        }
+        start = time.monotonic()
+        # Each model's inserts begin where the previous model's ended.
+        current = {"label": None, "began": start, "at": start}
+
+        def progress(label, done, total):
+            now = time.monotonic()
+            if label != current["label"]:
+                current.update(label=label, began=current["at"])
+            current["at"] = now
+            rate = done / max(now - current["began"], 1e-6)
+            self.stdout.write(
+                f"{label}: {done}/{total} ({rate:,.0f} rows/s)",
+                ending="\n" if done >= total else "\r",
+            )
+            self.stdout.flush()
+
+        seed_dataset(
+            **counts,
+            batch_size=batch_size,
+            backfill_timeline=options["backfill_timeline"],
+            password=options["password"],
+            progress=progress,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Seeded the dataset in {time.monotonic() - start:.1f}s")
+        )
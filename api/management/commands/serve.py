@@ -0,0 +1,110 @@
+import os
+import shlex
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from ...pubsub import InProcessBroker
+
+# Seconds WSGI workers keep their database connection open between requests.
+DEFAULT_CONN_MAX_AGE = "60"
+
+
+def default_workers():
+    return 2 * (os.cpu_count() or 1) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the project with gunicorn: sync WSGI workers with persistent "
+        "database connections, or uvicorn ASGI workers for the async views "
+        "and the notification stream."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=("wsgi", "asgi"), default="wsgi")
+        parser.add_argument("--bind", default="0.0.0.0:8000")
+        parser.add_argument("--workers", type=int, default=default_workers())
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=1,
+            help="Threads per WSGI worker, each with its own database connection.",
+        )
+        parser.add_argument("--timeout", type=int, default=30)
+        parser.add_argument(
+            "--max-requests",
+            type=int,
+            default=1000,
+            help="Restart a worker after this many requests (0 disables).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the server command and environment instead of running it.",
+        )
+
+    def handle(self, *args, mode, bind, workers, threads, **options):
+        argv = [
+            "gunicorn",
+            f"api_task.{mode}:application",
+            "--bind",
+            bind,
+            "--workers",
+            str(workers),
+            "--timeout",
+            str(options["timeout"]),
+        ]
+        if options["max_requests"]:
+            argv += [
+                "--max-requests",
+                str(options["max_requests"]),
+                "--max-requests-jitter",
+                str(options["max_requests"] // 10),
+            ]
+
+        if (
+            workers > 1
+            and settings.RESPONSE_CACHE_TIMEOUT
+            and isinstance(caches["default"], LocMemCache)
+        ):
+            # Invalidations would only reach the worker that made them.
+            raise CommandError(
+                "The response cache is local to each worker, so workers would "
+                "serve responses invalidated in other workers; set REDIS_URL, "
+                "set RESPONSE_CACHE_TIMEOUT=0 or run one worker."
+            )
+
+        env = {"DEBUG": os.environ.get("DEBUG", "0")}
+        if mode == "wsgi":
+            argv += ["--threads", str(threads)]
+            env["DB_CONN_MAX_AGE"] = os.environ.get(
+                "DB_CONN_MAX_AGE", DEFAULT_CONN_MAX_AGE
+            )
+        else:
+            broker = import_string(settings.NOTIFICATION_BROKER)
+            if workers > 1 and issubclass(broker, InProcessBroker):
+                # A stream only hears notifications created in its own worker.
+                raise CommandError(
+                    "The in-process notification broker can't reach streams "
+                    "served by other workers; set REDIS_URL or run one worker."
+                )
+            argv += ["--worker-class", "uvicorn_worker.UvicornWorker"]
+            # Django can't reuse connections across async requests; pool them
+            # with PgBouncer (DB_POOLER=pgbouncer) instead.
+            env["DB_CONN_MAX_AGE"] = "0"
+
+        if options["dry_run"]:
+            for name, value in sorted(env.items()):
+                self.stdout.write(f"{name}={value}")
+            self.stdout.write(shlex.join(argv))
+            return
+
+        os.environ.update(env)
+        try:
+            os.execvp(argv[0], argv)
+        except FileNotFoundError:
+            raise CommandError("gunicorn is not installed; see requirements.txt.")
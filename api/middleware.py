@@ -0,0 +1,101 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import acollect_streaming, collect, collect_streaming, registry
+from .timeline import atimeline_buffer, timeline_buffer
+
+
+class TimelineBufferMiddleware:
+    """Write all timeline events produced by a request in one batch."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with timeline_buffer():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        async with atimeline_buffer():
+            return await self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """
+    Time each request and its queries, serializers and renderers, send the
+    numbers as a ``Server-Timing`` header and add them to the route's
+    histograms. Disabled unless ``REQUEST_METRICS`` is set.
+
+    Streaming bodies are produced after the headers are sent, so streaming
+    responses get no header; their histograms are recorded when the server
+    closes them, including the queries run while streaming.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with collect() as metrics:
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = collect_streaming(
+                metrics,
+                response.streaming_content,
+                lambda: self.record(request, metrics),
+            )
+        else:
+            response["Server-Timing"] = metrics.server_timing()
+            self.record(request, metrics)
+        return response
+
+    async def __acall__(self, request):
+        # The metrics live in a context variable, so queries run through
+        # sync_to_async still count towards this request.
+        with collect() as metrics:
+            response = await self.get_response(request)
+        if response.streaming and response.is_async:
+            response.streaming_content = acollect_streaming(
+                metrics,
+                response.streaming_content,
+                lambda: self.arecord(request, metrics),
+            )
+        elif response.streaming:
+            # Consumed in a thread, where flushing is fine.
+            response.streaming_content = collect_streaming(
+                metrics,
+                response.streaming_content,
+                lambda: self.record(request, metrics),
+            )
+        else:
+            response["Server-Timing"] = metrics.server_timing()
+            await self.arecord(request, metrics)
+        return response
+
+    def record(self, request, metrics, flush=True):
+        match = request.resolver_match
+        return registry.add(
+            f"{request.method} {match.view_name if match else 'unresolved'}",
+            metrics,
+            flush=flush,
+        )
+
+    async def arecord(self, request, metrics):
+        if self.record(request, metrics, flush=False):
+            await sync_to_async(registry.flush)()
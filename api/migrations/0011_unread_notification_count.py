@@ -0,0 +1,34 @@
+# Generated by Django 5.0.7 on 2026-10-17 17:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_unread_counts(apps, schema_editor):
+    UserModel = apps.get_model('api', 'UserModel')
+    Notification = apps.get_model('api', 'Notification')
+    unread = (
+        Notification.objects.filter(user_id=OuterRef('pk'), mark_read=False)
+        .order_by()
+        .values('user_id')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    UserModel.objects.update(unread_notification_count=Coalesce(Subquery(unread), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usermodel',
+            name='unread_notification_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Unread notifications'),
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 
 from .managers import UserManager
+from .tracking import TrackedFieldsMixin
 
 
 def name_matching(val):
@@ -62,6 +63,10 @@ class UserModel(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created at")
     password = models.CharField(verbose_name="Password", max_length=128)
     password2 = models.CharField(verbose_name="Confirm Password", max_length=128)
+    # Maintained by api.counters; `reconcile_unread_counts` recomputes it.
+    unread_notification_count = models.PositiveIntegerField(
+        verbose_name="Unread notifications", default=0
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -105,7 +110,7 @@ class Project(models.Model):
         return "Project: " + self.title
 
 
-class Task(models.Model):
+class Task(TrackedFieldsMixin, models.Model):
 
     STATUS = [
         ("open", "Open"),
@@ -129,6 +134,16 @@ class Task(models.Model):
         null=True,
     )
 
+    tracked_fields = ("assignee",)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["assignee", "-id"], name="task_assignee_id_idx"),
+            models.Index(
+                fields=["assignee", "status"], name="task_assignee_status_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return "Task title: " + self.title
 
@@ -159,6 +174,16 @@ class Comment(models.Model):
         Project, on_delete=models.CASCADE, related_name="project_comment"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["task", "created_at"], name="comment_task_created_idx"
+            ),
+            models.Index(
+                fields=["project", "created_at"], name="comment_project_created_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return "Comment: " + self.text
 
@@ -178,6 +203,13 @@ class Timeline(models.Model):
         max_length=10, choices=EVENT_TYPES, default="created", verbose_name="Event Type"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "-time", "-id"], name="timeline_project_time_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return (
             "Timeline of "
@@ -189,7 +221,7 @@ class Timeline(models.Model):
         )
 
 
-class Notification(models.Model):
+class Notification(TrackedFieldsMixin, models.Model):
     text = models.TextField(verbose_name="Text")
     user = models.ForeignKey(
         UserModel, on_delete=models.CASCADE, related_name="notification_user"
@@ -197,5 +229,21 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created at")
     mark_read = models.BooleanField(default=False, verbose_name="Mark Read")
 
+    tracked_fields = ("mark_read",)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "mark_read"], name="notification_user_read_idx"
+            ),
+            # Unread notifications are listed far more often than read ones, so
+            # keep a small index covering only those rows, in list order.
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                condition=models.Q(mark_read=False),
+                name="notification_unread_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return "Notification: " + self.text + " for User: " + self.user.email
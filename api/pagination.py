@@ -0,0 +1,34 @@
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination keyed on an indexed column, so every page is fetched
+    with a ``WHERE key < cursor`` range scan instead of an OFFSET.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = "-id"
+
+    def get_paginated_envelope(self, key, data):
+        return {
+            "status_code": 200,
+            key: data,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        }
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, run in a thread."""
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+
+class TimelineKeysetPagination(KeysetPagination):
+    ordering = ("-time", "-id")
+
+
+class NotificationKeysetPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
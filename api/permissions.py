@@ -1,10 +1,12 @@
 from rest_framework.permissions import BasePermission
 
+from .roles import get_user_role
+
 
 class IsManager(BasePermission):
     def has_permission(self, request, view):
-        return (
+        return bool(
             request.user
             and request.user.is_authenticated
-            and request.user.user_profile.roles == "manager"
+            and get_user_role(request.user.pk) == "manager"
         )
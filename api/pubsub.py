@@ -0,0 +1,156 @@
+import asyncio
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .renderers import FastJSONRenderer
+
+_renderer = FastJSONRenderer()
+
+
+class InProcessBroker:
+    """
+    Delivers messages to subscribers of the current process only, so it suits
+    a single server process. Each subscriber gets a bounded queue; messages
+    for a subscriber that has fallen that far behind are dropped.
+    """
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or getattr(
+            settings, "NOTIFICATION_STREAM_QUEUE_SIZE", 100
+        )
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, user_id, message):
+        # Safe to call from any thread, e.g. a sync view run off the event loop.
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                # The subscriber's event loop has already been closed.
+                pass
+
+    @staticmethod
+    def _offer(queue, message):
+        if not queue.full():
+            queue.put_nowait(message)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers[user_id].add(entry)
+        try:
+            yield InProcessSubscription(entry[1])
+        finally:
+            with self._lock:
+                self._subscribers[user_id].discard(entry)
+                if not self._subscribers[user_id]:
+                    del self._subscribers[user_id]
+
+
+class InProcessSubscription:
+    def __init__(self, queue):
+        self.queue = queue
+
+    async def get(self, timeout):
+        """Return the next message, or ``None`` after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RedisBroker:
+    """
+    Delivers messages through Redis pub/sub, one channel per user, so every
+    server process sees notifications created by any other process or worker.
+    """
+
+    channel_prefix = "api:notifications:"
+
+    def __init__(self, url=None):
+        self.url = url or settings.NOTIFICATION_BROKER_URL
+        self._local = threading.local()
+
+    def _channel(self, user_id):
+        return f"{self.channel_prefix}{user_id}"
+
+    @property
+    def _client(self):
+        # redis-py clients aren't thread-safe to share for publishing; keep one
+        # per thread, each with its own connection pool.
+        client = getattr(self._local, "client", None)
+        if client is None:
+            import redis
+
+            client = self._local.client = redis.Redis.from_url(self.url)
+        return client
+
+    def publish(self, user_id, message):
+        self._client.publish(self._channel(user_id), message)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self._channel(user_id))
+            yield RedisSubscription(pubsub)
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+class RedisSubscription:
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    async def get(self, timeout):
+        """Return the next message, or ``None`` after ``timeout`` seconds."""
+        message = await self.pubsub.get_message(timeout=timeout)
+        if message is None:
+            return None
+        return message["data"].decode()
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """The broker configured by ``NOTIFICATION_BROKER``, one per process."""
+    return import_string(settings.NOTIFICATION_BROKER)()
+
+
+def format_event(notification):
+    """Render ``notification`` as a Server-Sent Events ``notification`` event."""
+    # Imported here: the serializers module queues notifications via api.tasks.
+    from .serializers import NotificationSerializer
+
+    data = _renderer.render(NotificationSerializer(notification).data).decode()
+    return f"id: {notification.pk}\nevent: notification\ndata: {data}\n\n"
+
+
+def publish_notifications(notifications):
+    """
+    Push ``notifications`` to their users' live streams once the current
+    transaction commits, so subscribers never see rows that were rolled back.
+    """
+    events = [(n.user_id, format_event(n)) for n in notifications]
+    if not events:
+        return
+
+    def publish():
+        broker = get_broker()
+        for user_id, event in events:
+            broker.publish(user_id, event)
+
+    transaction.on_commit(publish)
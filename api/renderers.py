@@ -0,0 +1,45 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` backed by orjson when it is installed.
+
+    Types orjson does not emit the way DRF does (datetimes, lazy strings,
+    decimals, querysets...) are passed to DRF's ``JSONEncoder``, and data
+    orjson can't encode at all (integers over 64 bits, unknown types) is
+    rendered by ``JSONRenderer``, errors included. The output decodes to the
+    same values, but isn't identical: floats use orjson's spelling (``1e16``,
+    not ``1e+16``) and NaN and infinities render as ``null`` where
+    ``JSONRenderer`` raises. Indented output (e.g. for the browsable API) and
+    non-default JSON settings fall back to the stdlib path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Keep JSONRenderer's escaping of the two characters JSON allows but
+        # JavaScript string literals don't.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -0,0 +1,206 @@
+import hashlib
+import inspect
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+# Scopes a cached response can depend on, each versioned per object ID.
+PROJECTS = "projects"  # projects listed for a user
+PROJECT = "project"  # a single project
+TASKS = "tasks"  # tasks assigned to a user
+TASK = "task"  # a single task
+TIMELINE = "timeline"  # timeline of a project
+NOTIFICATIONS = "notifications"  # unread notifications of a user
+
+CACHEABLE_STATUS_CODES = (200, 404)
+
+
+def _version_key(scope, pk):
+    return f"api:response_version:{scope}:{pk}"
+
+
+def get_versions(scopes):
+    """
+    Return the current version token of each ``(scope, pk)`` pair, creating
+    missing ones. Tokens are random, so a version evicted from the cache can
+    never come back with the value an old response was stored under.
+    """
+    keys = [_version_key(scope, pk) for scope, pk in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(scopes):
+    """Async version of ``get_versions``."""
+    keys = [_version_key(scope, pk) for scope, pk in scopes]
+    versions = await cache.aget_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        await cache.aset_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def _bump(keys):
+    cache.set_many({key: uuid.uuid4().hex for key in keys}, None)
+
+
+def bump_versions(scope, pks):
+    """
+    Invalidate every response cached for ``scope`` and the given IDs.
+
+    The versions are bumped right away, so later reads in this transaction
+    miss the cache, and again on commit, so responses cached by concurrent
+    requests from the old rows don't outlive the transaction.
+    """
+    if not getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300):
+        return
+    keys = [_version_key(scope, pk) for pk in set(pks) if pk is not None]
+    if keys:
+        _bump(keys)
+        transaction.on_commit(lambda: _bump(keys))
+
+
+def _digest(request, versions):
+    params = sorted(request.query_params.lists())
+    raw = "|".join(
+        [
+            request.get_host(),
+            request.path,
+            str(request.user.pk),
+            repr(params),
+            *versions,
+        ]
+    )
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def response_digest(request, scopes):
+    """
+    Hash of everything a cached response depends on. It changes whenever one
+    of ``scopes`` is bumped, so it serves both as cache key and as ETag.
+    """
+    return _digest(request, get_versions(scopes))
+
+
+async def aresponse_digest(request, scopes):
+    """Async version of ``response_digest``."""
+    return _digest(request, await aget_versions(scopes))
+
+
+def user_scope(scope):
+    """``get_scopes`` for responses about the requesting user."""
+
+    def get_scopes(request, kwargs):
+        return [(scope, request.user.id)]
+
+    return get_scopes
+
+
+def url_object_scope(scope, kwarg):
+    """``get_scopes`` for responses about the object whose ID is in ``kwarg``."""
+
+    def get_scopes(request, kwargs):
+        # Normalise so "/5/" and "/05/" share the version bumped for 5.
+        try:
+            return [(scope, int(kwargs[kwarg]))]
+        except (KeyError, TypeError, ValueError):
+            return []
+
+    return get_scopes
+
+
+def _not_modified(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    return etag in parse_etags(header)
+
+
+def _not_modified_response(etag):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def _cached_response(cached):
+    data, status_code = cached
+    return Response(data, status=status_code)
+
+
+def _tag(response, etag):
+    if response.status_code == status.HTTP_200_OK:
+        response["ETag"] = etag
+    return response
+
+
+def cache_response(get_scopes):
+    """
+    Cache the data of a view method's 200/404 responses per user, host, path
+    and query parameters, and tag 200 responses with an ETag so unchanged
+    resources are answered with 304 before the view runs.
+    ``get_scopes(request, kwargs)`` returns the ``(scope, pk)`` versions the
+    response depends on; ``bump_versions`` invalidates it. Works on both sync
+    and async view methods.
+    """
+
+    def decorator(view_method):
+        if inspect.iscoroutinefunction(view_method):
+
+            @wraps(view_method)
+            async def async_wrapper(self, request, *args, **kwargs):
+                timeout = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+                if not timeout:
+                    return await view_method(self, request, *args, **kwargs)
+
+                digest = await aresponse_digest(request, get_scopes(request, kwargs))
+                etag = f'"{digest}"'
+                if _not_modified(request, etag):
+                    return _not_modified_response(etag)
+
+                key = "api:response:" + digest
+                cached = await cache.aget(key)
+                if cached is not None:
+                    return _tag(_cached_response(cached), etag)
+                response = await view_method(self, request, *args, **kwargs)
+                if response.status_code in CACHEABLE_STATUS_CODES:
+                    await cache.aset(
+                        key, (response.data, response.status_code), timeout
+                    )
+                return _tag(response, etag)
+
+            return async_wrapper
+
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            timeout = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+            if not timeout:
+                return view_method(self, request, *args, **kwargs)
+
+            digest = response_digest(request, get_scopes(request, kwargs))
+            etag = f'"{digest}"'
+            # The ETag was only handed out with a 200 for this exact digest,
+            # so a match means the response would be the same.
+            if _not_modified(request, etag):
+                return _not_modified_response(etag)
+
+            key = "api:response:" + digest
+            cached = cache.get(key)
+            if cached is not None:
+                return _tag(_cached_response(cached), etag)
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code in CACHEABLE_STATUS_CODES:
+                cache.set(key, (response.data, response.status_code), timeout)
+            return _tag(response, etag)
+
+        return wrapper
+
+    return decorator
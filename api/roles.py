@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Profile
+
+# Cached for users without a profile so they don't miss the cache every time.
+NO_ROLE = ""
+
+
+def _cache_key(user_id):
+    return f"api:user_role:{user_id}"
+
+
+def get_user_role(user_id):
+    """
+    Return the profile role of the user with ``user_id``, or ``None`` if the
+    user has no profile. The result is cached until the profile changes.
+    """
+    key = _cache_key(user_id)
+    role = cache.get(key)
+    if role is None:
+        role = (
+            Profile.objects.filter(user_id=user_id)
+            .values_list("roles", flat=True)
+            .first()
+        ) or NO_ROLE
+        cache.set(key, role, settings.ROLE_CACHE_TIMEOUT)
+    return role or None
+
+
+def invalidate_user_role(user_id):
+    cache.delete(_cache_key(user_id))
@@ -0,0 +1,256 @@
+"""
+Synthetic datasets for profiling and load testing, inserted with batched
+``bulk_create`` calls (see ``manage.py seed_data`` and ``benchmarks``).
+
+``bulk_create`` sends no model signals, so seeding never goes through the
+timeline, notification or cache receivers of ``api.signals``; timeline rows
+are inserted directly instead and the unread counters reconciled at the end.
+"""
+
+import datetime
+import random
+from array import array
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import Max
+
+from .counters import reconcile_unread_counts
+from .models import (
+    Comment,
+    Document,
+    Notification,
+    Profile,
+    Project,
+    Task,
+    Timeline,
+    UserModel,
+)
+
+# Faker is slow next to the inserts, so text is drawn from pools this large.
+TEXT_POOL_SIZE = 1000
+
+
+def bulk_insert(model, rows, total, batch_size, progress=None, label=None, **kwargs):
+    """
+    Insert ``total`` objects from the iterable ``rows`` one batch at a time,
+    so only a single batch is ever held in memory, calling
+    ``progress(label, done, total)`` after each batch.
+    """
+    rows = iter(rows)
+    label = label or model._meta.verbose_name_plural
+    done = 0
+    while batch := list(islice(rows, batch_size)):
+        model.objects.bulk_create(batch, **kwargs)
+        done += len(batch)
+        if progress:
+            progress(label, done, total)
+    return done
+
+
+def _ids(queryset, *fields):
+    """Load integer columns into compact arrays, one per field."""
+    columns = [array("q") for _ in fields]
+    for row in queryset.order_by("id").values_list(*fields).iterator(5000):
+        for column, value in zip(columns, row):
+            column.append(value)
+    return columns
+
+
+def _last(model, field):
+    return model.objects.aggregate(last=Max(field))["last"] or 0
+
+
+def seed_dataset(
+    users=200,
+    projects=100,
+    tasks=5000,
+    comments=10000,
+    timeline=20000,
+    notifications=20000,
+    documents=1000,
+    batch_size=2000,
+    backfill_timeline=False,
+    password="password",
+    progress=None,
+):
+    """
+    Insert a synthetic dataset with Faker text, reproducible across runs.
+
+    Every user gets a profile, the first one as a manager who is also a
+    member of the first ten projects; all users sign in with ``password``,
+    hashed once. ``timeline`` random events are inserted, plus, with
+    ``backfill_timeline``, the "created" event the signals would have
+    recorded for every project, task and document.
+    """
+    from faker import Faker
+
+    rng = random.Random(42)
+    fake = Faker()
+    fake.seed_instance(42)
+    names = [fake.name() for _ in range(TEXT_POOL_SIZE)]
+    titles = [fake.catch_phrase()[:100] for _ in range(TEXT_POOL_SIZE)]
+    sentences = [fake.sentence() for _ in range(TEXT_POOL_SIZE)]
+    paragraphs = [fake.paragraph() for _ in range(TEXT_POOL_SIZE)]
+    file_names = [fake.file_name(extension="pdf")[:80] for _ in range(100)]
+
+    def insert(model, rows, total, **kwargs):
+        return bulk_insert(model, rows, total, batch_size, progress, **kwargs)
+
+    # Numbered past existing rows, so seeding again adds to the dataset.
+    first_user = _last(UserModel, "id")
+    first_version = _last(Document, "version")
+    hashed = make_password(password)
+    insert(
+        UserModel,
+        (
+            UserModel(
+                username=rng.choice(names),
+                email=f"user{first_user + i}@example.com",
+                password=hashed,
+                password2=hashed,
+            )
+            for i in range(users)
+        ),
+        users,
+    )
+    (user_ids,) = _ids(UserModel.objects.filter(id__gt=first_user), "id")
+
+    roles = [role for role, _ in Profile.ROLES]
+    insert(
+        Profile,
+        (
+            Profile(
+                user_id=user_id,
+                roles="manager" if i == 0 else rng.choice(roles),
+                profile_picture="profile_pics/seed.png",
+                contact_number=f"03{rng.randrange(10**9):09d}",
+            )
+            for i, user_id in enumerate(user_ids)
+        ),
+        len(user_ids),
+    )
+
+    today = datetime.date.today()
+    insert(
+        Project,
+        (
+            Project(
+                title=rng.choice(titles),
+                description=rng.choice(paragraphs),
+                start_date=today,
+                end_date=today + datetime.timedelta(days=30),
+            )
+            for _ in range(projects)
+        ),
+        projects,
+    )
+    (project_ids,) = _ids(Project.objects.all(), "id")
+
+    members = min(5, len(user_ids))
+    membership = Project.team_members.through
+    insert(
+        membership,
+        (
+            membership(project_id=project_id, usermodel_id=user_id)
+            for project_id in project_ids
+            for user_id in rng.sample(user_ids, members)
+        ),
+        len(project_ids) * members,
+        ignore_conflicts=True,
+    )
+    # The manager sees some projects in every list.
+    insert(
+        membership,
+        (
+            membership(project_id=project_id, usermodel_id=user_ids[0])
+            for project_id in project_ids[:10]
+        ),
+        min(10, len(project_ids)),
+        ignore_conflicts=True,
+    )
+
+    insert(
+        Document,
+        (
+            Document(
+                name=rng.choice(file_names),
+                description=rng.choice(sentences),
+                file=f"document_files/seed-{first_version + i}.pdf",
+                version=first_version + i + 1,
+                project_id=rng.choice(project_ids),
+            )
+            for i in range(documents)
+        ),
+        documents,
+    )
+
+    statuses = [status for status, _ in Task.STATUS]
+    insert(
+        Task,
+        (
+            Task(
+                title=rng.choice(titles),
+                description=rng.choice(paragraphs),
+                status=rng.choice(statuses),
+                project_id=rng.choice(project_ids),
+                assignee_id=rng.choice(user_ids),
+            )
+            for _ in range(tasks)
+        ),
+        tasks,
+    )
+    task_ids, task_projects = _ids(Task.objects.all(), "id", "project_id")
+
+    def comment():
+        i = rng.randrange(len(task_ids))
+        return Comment(
+            text=rng.choice(sentences),
+            author_id=rng.choice(user_ids),
+            task_id=task_ids[i],
+            project_id=task_projects[i],
+        )
+
+    if task_ids:
+        insert(Comment, (comment() for _ in range(comments)), comments)
+
+    event_types = [event_type for event_type, _ in Timeline.EVENT_TYPES]
+    insert(
+        Timeline,
+        (
+            Timeline(
+                project_id=rng.choice(project_ids), event_type=rng.choice(event_types)
+            )
+            for _ in range(timeline)
+        ),
+        timeline,
+    )
+    if backfill_timeline:
+        for model in (Project, Document, Task):
+            field = "id" if model is Project else "project_id"
+            rows = model.objects.order_by().values_list(field, flat=True)
+            insert(
+                Timeline,
+                (
+                    Timeline(project_id=project_id, event_type="created")
+                    for project_id in rows.iterator(batch_size)
+                ),
+                rows.count(),
+                label=f"timelines of {model._meta.verbose_name_plural}",
+            )
+
+    insert(
+        Notification,
+        (
+            Notification(
+                text=rng.choice(sentences),
+                user_id=rng.choice(user_ids),
+                mark_read=rng.random() < 0.8,
+            )
+            for _ in range(notifications)
+        ),
+        notifications,
+    )
+    for start in range(0, len(user_ids), batch_size):
+        end = start + batch_size
+        reconcile_unread_counts(user_ids[start:end])
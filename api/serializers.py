@@ -1,6 +1,12 @@
+from django.db import transaction
+from django.utils.functional import cached_property
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import TokenError
 
+from .blacklist import CachedRefreshToken
+from .counters import adjust_unread_counts
+from .instrumentation import timed
 from .models import (
     Comment,
     Document,
@@ -11,6 +17,9 @@ from .models import (
     Timeline,
     UserModel,
 )
+from .response_cache import NOTIFICATIONS, TASK, TASKS, bump_versions
+from .tasks import assignment_notification, create_notifications, run_side_effect
+from .timeline import record_timeline_event
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -32,10 +41,12 @@ class UserSerializer(serializers.ModelSerializer):
             "password",
             "password2",
             "user_profile",
+            "unread_notification_count",
         ]
         extra_kwargs = {
             "password": {"write_only": True},
             "password2": {"write_only": True},
+            "unread_notification_count": {"read_only": True},
         }
 
     def validate(self, data):
@@ -69,12 +80,18 @@ class LogoutSerializer(serializers.Serializer):
 
     def save(self, **kwargs):
         try:
-            refresh = RefreshToken(self.token)
+            refresh = CachedRefreshToken(self.token)
             refresh.blacklist()
         except TokenError:
             self.fail("bad_token")
 
 
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """``token/refresh/``, with the blacklist check of ``CachedRefreshToken``."""
+
+    token_class = CachedRefreshToken
+
+
 class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
@@ -111,6 +128,124 @@ class TaskSerializer(serializers.ModelSerializer):
         return task
 
 
+def _check_ids_exist(model, field_name, ids):
+    ids = {pk for pk in ids if pk is not None}
+    found = set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+    missing = sorted(ids - found)
+    if missing:
+        raise serializers.ValidationError(
+            {field_name: f'Invalid pk "{missing[0]}" - object does not exist.'}
+        )
+
+
+class TaskBulkCreateListSerializer(serializers.ListSerializer):
+    def validate(self, attrs):
+        # One query per related model instead of one per task and field.
+        _check_ids_exist(Project, "project", (item["project_id"] for item in attrs))
+        _check_ids_exist(
+            UserModel, "assignee", (item.get("assignee_id") for item in attrs)
+        )
+        return attrs
+
+    def create(self, validated_data):
+        tasks = [Task(**item) for item in validated_data]
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            for task in tasks:
+                record_timeline_event(task.project_id, "created")
+        bump_versions(TASK, [task.pk for task in tasks])
+        bump_versions(TASKS, [task.assignee_id for task in tasks])
+        return tasks
+
+
+class TaskBulkCreateSerializer(TaskSerializer):
+    """
+    Validates many tasks at once and inserts them with ``bulk_create``. Related
+    IDs are checked in bulk rather than through ``PrimaryKeyRelatedField``.
+    """
+
+    project = serializers.IntegerField(source="project_id")
+    assignee = serializers.IntegerField(
+        source="assignee_id", allow_null=True, required=False
+    )
+
+    class Meta(TaskSerializer.Meta):
+        list_serializer_class = TaskBulkCreateListSerializer
+
+
+class TaskBulkUpdateListSerializer(serializers.ListSerializer):
+    def validate(self, attrs):
+        ids = [item["id"] for item in attrs]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError({"id": "Duplicate task IDs."})
+        _check_ids_exist(Task, "id", ids)
+        _check_ids_exist(
+            UserModel, "assignee", (item.get("assignee_id") for item in attrs)
+        )
+        return attrs
+
+    def update(self, queryset, validated_data):
+        ids = [item["id"] for item in validated_data]
+        fields = set()
+        changed = []
+        notifications = []
+        previous_assignees = []
+        with transaction.atomic():
+            # Locked, so no task can go away between the check and the write.
+            tasks = queryset.select_for_update().in_bulk(ids)
+            # Deleted since validate() checked them.
+            missing = sorted(set(ids) - tasks.keys())
+            if missing:
+                raise serializers.ValidationError(
+                    {"id": f'Invalid pk "{missing[0]}" - object does not exist.'}
+                )
+            for item in validated_data:
+                task = tasks[item["id"]]
+                previous_assignee = task.assignee_id
+                updated = [
+                    attr
+                    for attr in ("status", "assignee_id")
+                    if attr in item and getattr(task, attr) != item[attr]
+                ]
+                if not updated:
+                    continue
+                for attr in updated:
+                    setattr(task, attr, item[attr])
+                fields.update(updated)
+                changed.append(task)
+                previous_assignees.append(previous_assignee)
+                if task.assignee_id is not None and task.has_changed("assignee"):
+                    notifications.append(
+                        assignment_notification(task.assignee_id, task.title)
+                    )
+
+            if changed:
+                Task.objects.bulk_update(changed, sorted(fields))
+            for task in changed:
+                record_timeline_event(task.project_id, "updated")
+            if notifications:
+                run_side_effect(create_notifications, notifications)
+        if changed:
+            bump_versions(TASK, [task.pk for task in changed])
+            bump_versions(
+                TASKS, [task.assignee_id for task in changed] + previous_assignees
+            )
+        return [tasks[pk] for pk in ids]
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    """Partial status/assignee changes for many tasks, written with ``bulk_update``."""
+
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Task.STATUS, required=False)
+    assignee = serializers.IntegerField(
+        source="assignee_id", allow_null=True, required=False
+    )
+
+    class Meta:
+        list_serializer_class = TaskBulkUpdateListSerializer
+
+
 class DocumentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Document
@@ -143,3 +278,107 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ["id", "text", "user", "created_at", "mark_read"]
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    """
+    Marks the requesting user's unread notifications as read with a single
+    UPDATE, optionally limited to ``ids`` and/or rows created before ``before``.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+    before = serializers.DateTimeField(required=False)
+
+    def save(self, **kwargs):
+        user_id = self.context["request"].user.id
+        notifications = Notification.objects.filter(user_id=user_id, mark_read=False)
+        if "ids" in self.validated_data:
+            notifications = notifications.filter(id__in=self.validated_data["ids"])
+        if "before" in self.validated_data:
+            notifications = notifications.filter(
+                created_at__lt=self.validated_data["before"]
+            )
+        with transaction.atomic():
+            updated = notifications.update(mark_read=True)
+            adjust_unread_counts({user_id: -updated})
+        if updated:
+            bump_versions(NOTIFICATIONS, [user_id])
+        return updated
+
+
+class ValuesSerializer:
+    """
+    Read-only, list-only counterpart of a ``ModelSerializer``.
+
+    Rows are fetched with ``values_list(named=True)`` and turned into dicts
+    through a field-to-column mapping worked out once from the serializer's
+    fields, skipping per-instance model and field machinery. Values of plain
+    fields are used as they come from the database; every other field still
+    goes through its ``to_representation``, so the output matches the
+    serializer's.
+    """
+
+    IDENTITY_FIELDS = (
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.IntegerField,
+    )
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def fields(self):
+        model = self.serializer_class.Meta.model
+        fields = []
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            column = model._meta.get_field(field.source).attname
+            if isinstance(field, self.IDENTITY_FIELDS) or (
+                isinstance(field, serializers.PrimaryKeyRelatedField)
+                and field.pk_field is None
+            ):
+                to_representation = None
+            else:
+                to_representation = field.to_representation
+            fields.append((name, column, to_representation))
+        return fields
+
+    def values(self, queryset):
+        """Return ``queryset`` as named tuples holding just the needed columns."""
+        return queryset.values_list(
+            *(column for _, column, _ in self.fields), named=True
+        )
+
+    def iterate(self, rows):
+        """Yield the representation of each row, without holding them all."""
+        keys = [name for name, _, _ in self.fields]
+        converters = [
+            (index, to_representation)
+            for index, (_, _, to_representation) in enumerate(self.fields)
+            if to_representation is not None
+        ]
+        if not converters:
+            for row in rows:
+                yield dict(zip(keys, row))
+            return
+
+        for row in rows:
+            row = list(row)
+            for index, to_representation in converters:
+                if row[index] is not None:
+                    row[index] = to_representation(row[index])
+            yield dict(zip(keys, row))
+
+    def serialize(self, rows):
+        with timed("serialize"):
+            return list(self.iterate(rows))
+
+
+task_values_serializer = ValuesSerializer(TaskSerializer)
+comment_values_serializer = ValuesSerializer(CommentSerializer)
+timeline_values_serializer = ValuesSerializer(TimelineSerializer)
+notification_values_serializer = ValuesSerializer(NotificationSerializer)
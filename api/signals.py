@@ -1,13 +1,40 @@
-from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
-
-from .models import Comment, Document, Notification, Project, Task, Timeline
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .blacklist import remember_blacklisted
+from .counters import adjust_unread_counts
+from .models import Comment, Document, Notification, Profile, Project, Task, UserModel
+from .pubsub import publish_notifications
+from .response_cache import (
+    NOTIFICATIONS,
+    PROJECT,
+    PROJECTS,
+    TASK,
+    TASKS,
+    TIMELINE,
+    bump_versions,
+)
+from .roles import invalidate_user_role
+from .tasks import assignment_notification, create_notifications, run_side_effect
+from .timeline import record_timeline_event
+
+
+def _deleted_with_project(origin):
+    # Rows removed by a project delete cascade have no timeline left to join.
+    return isinstance(origin, Project) or getattr(origin, "model", None) is Project
 
 
 @receiver(post_save, sender=Project)
 def project_created(sender, instance, created, **kwargs):
     if created:
-        Timeline.objects.create(project=instance)
+        record_timeline_event(instance.pk)
 
 
 @receiver(post_save, sender=Task)
@@ -15,66 +42,174 @@ def create_timeline_for_task(sender, instance, created=False, **kwargs):
     if created:
         # Prevent the "updated" event from being created right after "created"
         instance._initial_creation = True
-        Timeline.objects.create(project=instance.project, event_type="created")
+        record_timeline_event(instance.project_id, "created")
     else:
         if getattr(instance, "_initial_creation", False):
             instance._initial_creation = False
         else:
-            Timeline.objects.create(project=instance.project, event_type="updated")
+            record_timeline_event(instance.project_id, "updated")
 
 
 @receiver(post_delete, sender=Task)
 def create_timeline_for_task_delete(sender, instance, **kwargs):
-    Timeline.objects.create(project=instance.project, event_type="deleted")
+    if _deleted_with_project(kwargs.get("origin")):
+        return
+    record_timeline_event(instance.project_id, "deleted")
 
 
 @receiver(post_save, sender=Document)
 def create_timeline_for_document(sender, instance, created=False, **kwargs):
     if created:
         instance._initial_creation = True
-        Timeline.objects.create(project=instance.project, event_type="created")
+        record_timeline_event(instance.project_id, "created")
     else:
         if getattr(instance, "_initial_creation", False):
             instance._initial_creation = False
         else:
-            Timeline.objects.create(project=instance.project, event_type="updated")
+            record_timeline_event(instance.project_id, "updated")
 
 
 @receiver(post_delete, sender=Document)
 def create_timeline_for_task_delete(sender, instance, **kwargs):
-    Timeline.objects.create(project=instance.project, event_type="deleted")
+    if _deleted_with_project(kwargs.get("origin")):
+        return
+    record_timeline_event(instance.project_id, "deleted")
 
 
 @receiver(post_save, sender=Comment)
 def create_timeline_for_comment(sender, instance, created=False, **kwargs):
     if created:
         instance._initial_creation = True
-        Timeline.objects.create(project=instance.project, event_type="created")
+        record_timeline_event(instance.project_id, "created")
     else:
         if getattr(instance, "_initial_creation", False):
             instance._initial_creation = False
         else:
-            Timeline.objects.create(project=instance.project, event_type="updated")
+            record_timeline_event(instance.project_id, "updated")
 
 
 @receiver(post_delete, sender=Comment)
 def create_timeline_for_task_delete(sender, instance, **kwargs):
-    Timeline.objects.create(project=instance.project, event_type="deleted")
+    if _deleted_with_project(kwargs.get("origin")):
+        return
+    record_timeline_event(instance.project_id, "deleted")
 
 
 @receiver(pre_save, sender=Task)
 def task_assign_notification(sender, instance, **kwargs):
-    try:
-        old_task = Task.objects.get(id=instance.id)
-        if old_task:
-            if old_task.assignee != instance.assignee:
-                Notification.objects.create(
-                    text=f"""New task "{instance.title}" has been assigned to you""",
-                    user=instance.assignee,
-                )
-            else:
-                pass
-        else:
-            pass
-    except:
-        pass
+    if instance.pk is None or instance.assignee_id is None:
+        return
+    changed = instance.has_changed("assignee")
+    if changed is None:
+        # Not loaded through the ORM, so compare against the stored row.
+        changed = (
+            Task.objects.filter(pk=instance.pk)
+            .exclude(assignee_id=instance.assignee_id)
+            .exists()
+        )
+    if changed:
+        run_side_effect(
+            create_notifications,
+            [assignment_notification(instance.assignee_id, instance.title)],
+        )
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_role(sender, instance, **kwargs):
+    invalidate_user_role(instance.user_id)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def cache_blacklisted_token(sender, instance, **kwargs):
+    remember_blacklisted(instance.token.jti, instance.token.expires_at.timestamp())
+
+
+@receiver(post_save, sender=UserModel)
+def reset_user_responses(sender, instance, created, **kwargs):
+    # A reused primary key must not see responses cached for a deleted user.
+    if created:
+        bump_versions(PROJECTS, [instance.pk])
+        bump_versions(TASKS, [instance.pk])
+        bump_versions(NOTIFICATIONS, [instance.pk])
+
+
+@receiver(post_save, sender=Project)
+def invalidate_project_responses(sender, instance, created, **kwargs):
+    bump_versions(PROJECT, [instance.pk])
+    if created:
+        bump_versions(TIMELINE, [instance.pk])
+    else:
+        bump_versions(PROJECTS, instance.team_members.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=Project)
+def invalidate_deleted_project_responses(sender, instance, **kwargs):
+    bump_versions(PROJECTS, instance.team_members.values_list("id", flat=True))
+    bump_versions(PROJECT, [instance.pk])
+    bump_versions(TIMELINE, [instance.pk])
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def invalidate_membership_responses(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        project_ids = list(
+            pk_set or instance.project_members.values_list("id", flat=True)
+        )
+        user_ids = {instance.pk}
+    else:
+        project_ids = [instance.pk]
+        user_ids = set(pk_set or ())
+    # Every member's list shows the project's members, so all of them change.
+    user_ids.update(
+        sender.objects.filter(project_id__in=project_ids).values_list(
+            "usermodel_id", flat=True
+        )
+    )
+    bump_versions(PROJECTS, user_ids)
+    bump_versions(PROJECT, project_ids)
+
+
+@receiver(post_save, sender=Task)
+def invalidate_task_responses(sender, instance, **kwargs):
+    bump_versions(TASK, [instance.pk])
+    bump_versions(TASKS, [instance.assignee_id, instance.get_loaded_value("assignee")])
+
+
+@receiver(post_delete, sender=Task)
+def invalidate_deleted_task_responses(sender, instance, **kwargs):
+    bump_versions(TASK, [instance.pk])
+    bump_versions(TASKS, [instance.assignee_id])
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_notification_responses(sender, instance, **kwargs):
+    bump_versions(NOTIFICATIONS, [instance.user_id])
+
+
+@receiver(post_save, sender=Notification)
+def count_saved_notification(sender, instance, created, **kwargs):
+    if created:
+        delta = 0 if instance.mark_read else 1
+    elif instance.has_changed("mark_read"):
+        delta = -1 if instance.mark_read else 1
+    else:
+        return
+    adjust_unread_counts({instance.user_id: delta})
+
+
+@receiver(post_save, sender=Notification)
+def stream_created_notification(sender, instance, created, **kwargs):
+    if created:
+        publish_notifications([instance])
+
+
+@receiver(post_delete, sender=Notification)
+def count_deleted_notification(sender, instance, **kwargs):
+    if not instance.mark_read:
+        adjust_unread_counts({instance.user_id: -1})
@@ -0,0 +1,48 @@
+from collections import Counter
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+
+from .counters import adjust_unread_counts
+from .models import Notification, Timeline
+from .pubsub import publish_notifications
+from .response_cache import NOTIFICATIONS, TIMELINE, bump_versions
+
+
+@shared_task
+def write_timeline_events(events):
+    """Insert ``(project_id, event_type)`` pairs as Timeline rows."""
+    Timeline.objects.bulk_create(
+        Timeline(project_id=project_id, event_type=event_type)
+        for project_id, event_type in events
+    )
+    bump_versions(TIMELINE, [project_id for project_id, _ in events])
+
+
+@shared_task
+def create_notifications(notifications):
+    """Insert ``(user_id, text)`` pairs as Notification rows."""
+    created = Notification.objects.bulk_create(
+        Notification(user_id=user_id, text=text) for user_id, text in notifications
+    )
+    publish_notifications(created)
+    user_ids = [user_id for user_id, _ in notifications]
+    adjust_unread_counts(Counter(user_ids))
+    bump_versions(NOTIFICATIONS, user_ids)
+
+
+def assignment_notification(assignee_id, title):
+    """The ``(user_id, text)`` pair telling ``assignee_id`` about a new task."""
+    return (assignee_id, f"""New task "{title}" has been assigned to you""")
+
+
+def run_side_effect(task, *args):
+    """
+    Run ``task`` inline, or queue it on Celery once the current transaction
+    commits when ``ASYNC_SIDE_EFFECTS`` is enabled.
+    """
+    if getattr(settings, "ASYNC_SIDE_EFFECTS", False):
+        transaction.on_commit(lambda: task.delay(*args))
+    else:
+        task(*args)
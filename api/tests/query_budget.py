@@ -0,0 +1,104 @@
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, resolve
+
+# The most queries each endpoint may run, keyed like the request metrics
+# (``"<method> <view name>"``) and independent of how many rows it returns;
+# savepoints around writes count too. Lower a budget when a change saves
+# queries, never raise one to make a test pass without knowing why.
+QUERY_BUDGETS = {
+    "POST login": 3,
+    "POST logout": 7,
+    "GET user_data": 1,
+    "GET projects-list": 3,
+    "GET projects-detail": 2,
+    "PUT projects-detail": 5,
+    "DELETE projects-detail": 9,
+    "GET tasks-list": 2,
+    "POST tasks-list": 5,
+    "GET tasks-detail": 1,
+    "PUT tasks-detail": 3,
+    "DELETE tasks-detail": 4,
+    "POST tasks-bulk-create": 6,
+    "PATCH tasks-bulk-create": 9,
+    "POST task_assign": 6,
+    "GET task_export": 1,
+    "GET documents-list": 1,
+    "GET documents-detail": 1,
+    "PUT documents-detail": 2,
+    "DELETE documents-detail": 2,
+    "GET comments-list": 1,
+    "POST comments-list": 5,
+    "GET comments-detail": 1,
+    "PUT comments-detail": 3,
+    "DELETE comments-detail": 3,
+    "GET notifications-list": 2,
+    "GET notifications-unread-count": 1,
+    "POST notifications-mark-all-read": 4,
+    "PUT mark_notifications": 6,
+    "GET timeline": 1,
+    "GET timeline_export": 2,
+}
+
+
+def endpoint(method, path):
+    """``"<method> <view name>"`` of the request, or None if it doesn't resolve."""
+    try:
+        return f"{method} {resolve(path).view_name}"
+    except Resolver404:
+        return None
+
+
+class QueryBudgetMixin:
+    """
+    Fail the test if any request made while it runs, through any test client,
+    goes over its endpoint's budget in ``query_budgets``. Endpoints without a
+    budget are not checked.
+    """
+
+    query_budgets = QUERY_BUDGETS
+
+    def _pre_setup(self):
+        # Before setUp, which the test cases override without calling super().
+        super()._pre_setup()
+        self._over_budget = []
+        self._request = None
+        queries = CaptureQueriesContext(connection)
+        queries.__enter__()
+        self.addCleanup(queries.__exit__, None, None, None)
+
+        def started(sender, environ=None, scope=None, **kwargs):
+            if environ is not None:
+                method, path = environ["REQUEST_METHOD"], environ["PATH_INFO"]
+            else:
+                method, path = scope["method"], scope["path"]
+            self._request = (endpoint(method, path), len(queries))
+
+        def finished(sender, **kwargs):
+            if self._request is None:
+                return
+            name, start = self._request
+            self._request = None
+            budget = self.query_budgets.get(name)
+            executed = queries.captured_queries[start:]
+            if budget is not None and len(executed) > budget:
+                self._over_budget.append((name, budget, executed))
+
+        # Held strongly: receivers are connected weakly by default.
+        self._receivers = (started, finished)
+        request_started.connect(started)
+        request_finished.connect(finished)
+        self.addCleanup(request_started.disconnect, started)
+        self.addCleanup(request_finished.disconnect, finished)
+        # Cleanups run last-in first-out, so this runs before the disconnects.
+        self.addCleanup(self.assertWithinQueryBudgets)
+
+    def assertWithinQueryBudgets(self):
+        if not self._over_budget:
+            return
+        lines = []
+        for name, budget, executed in self._over_budget:
+            lines.append(f"{name} ran {len(executed)} queries, budget {budget}:")
+            lines += [f"  {query['sql']}" for query in executed]
+        self.fail("\n".join(lines))
@@ -0,0 +1,94 @@
+from asgiref.sync import iscoroutinefunction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import include, path, resolve
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..middleware import RequestMetricsMiddleware
+from ..models import Project, UserModel
+from ..urls import build_urlpatterns
+from . import tests_response_cache, tests_views
+from .tests_instrumentation import server_timing
+
+# Served by the async read views, as under api_task.asgi.
+urlpatterns = [path("api/", include(build_urlpatterns(async_views=True)))]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncURLConfTestCases(SimpleTestCase):
+    def test_read_endpoints_are_async(self):
+        for url in (
+            "/api/projects/",
+            "/api/projects/1/",
+            "/api/tasks/",
+            "/api/tasks/1/",
+            "/api/timeline/1/",
+            "/api/notifications/",
+            "/api/user/",
+        ):
+            with self.subTest(url=url):
+                self.assertTrue(iscoroutinefunction(resolve(url).func))
+
+    @override_settings(ROOT_URLCONF="api_task.urls")
+    def test_default_urlconf_is_sync(self):
+        self.assertFalse(iscoroutinefunction(resolve("/api/tasks/").func))
+
+
+@override_settings(ROOT_URLCONF=__name__, RESPONSE_CACHE_TIMEOUT=0)
+class AsyncMiddlewareTestCases(TestCase):
+    async def test_request_metrics_count_async_queries(self):
+        async def view(request):
+            pass
+
+        self.assertTrue(iscoroutinefunction(RequestMetricsMiddleware(view)))
+
+        user = await UserModel.objects.acreate(email="test@gmail.com")
+        project = await Project.objects.acreate(
+            title="Test Project",
+            description="abc",
+            start_date="2021-09-01",
+            end_date="2024-09-30",
+        )
+        await project.team_members.aadd(user)
+        response = await self.async_client.get(
+            "/api/projects/",
+            headers={"Authorization": f"Bearer {AccessToken.for_user(user)}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        # The user, the projects and their prefetched team members.
+        self.assertEqual(server_timing(response)["db"][1], "3 queries")
+
+
+# The sync test cases, rerun against the async views.
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncProjectTestCases(tests_views.ProjectTestCases):
+    pass
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncTaskTestCases(tests_views.TaskTestCases):
+    pass
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncTimelineTestCases(tests_views.TimelineTestCases):
+    pass
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncNotificationTestCases(tests_views.NotificationTestCases):
+    pass
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncGetUserDataTestCase(tests_views.GetUserDataTestCase):
+    pass
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncResponseCacheTestCases(tests_response_cache.ResponseCacheTestCases):
+    pass
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncConditionalGetTestCases(tests_response_cache.ConditionalGetTestCases):
+    pass
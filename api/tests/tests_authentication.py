@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..authentication import LazyTokenUser, StatelessJWTAuthentication
+from ..models import Project, Task, UserModel
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class StatelessJWTAuthenticationTestCases(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        project = Project.objects.create(
+            title="Test Project",
+            description="abc",
+            start_date="2021-09-01",
+            end_date="2024-09-30",
+        )
+        Task.objects.create(
+            title="Test Task",
+            description="abc",
+            status="open",
+            project=project,
+            assignee=self.user,
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def get_tasks(self, authentication_class):
+        with mock.patch.object(
+            APIView, "authentication_classes", [authentication_class]
+        ):
+            return self.client.get("/api/tasks/")
+
+    def test_list_skips_user_query(self):
+        with self.assertNumQueries(2):
+            response = self.get_tasks(JWTAuthentication)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(1):
+            response = self.get_tasks(StatelessJWTAuthentication)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["tasks"]), 1)
+
+    def test_user_is_loaded_lazily(self):
+        user = LazyTokenUser(AccessToken(str(self.token)))
+        with self.assertNumQueries(0):
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(user, self.user)
+            self.assertEqual(self.user, user)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "test@gmail.com")
+            self.assertEqual(user.username, "test")
@@ -0,0 +1,91 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from ..blacklist import BlacklistCache, CachedRefreshToken, blacklist_cache
+from ..models import UserModel
+
+
+class TokenBlacklistCacheTestCases(TestCase):
+    def setUp(self):
+        blacklist_cache.clear()
+        self.user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        self.token = str(RefreshToken.for_user(self.user))
+
+    def test_blacklisted_token_is_rejected_without_query(self):
+        CachedRefreshToken(self.token).blacklist()
+        with self.assertNumQueries(0):
+            with self.assertRaises(TokenError):
+                CachedRefreshToken(self.token)
+
+    def test_misses_are_not_cached_by_default(self):
+        with self.assertNumQueries(1):
+            CachedRefreshToken(self.token)
+        with self.assertNumQueries(1):
+            CachedRefreshToken(self.token)
+
+    @override_settings(TOKEN_BLACKLIST_NEGATIVE_CACHE_TTL=60)
+    def test_misses_are_cached_when_enabled(self):
+        CachedRefreshToken(self.token)
+        with self.assertNumQueries(0):
+            CachedRefreshToken(self.token)
+
+    def test_refresh_rotates_and_rejects_reuse_from_cache(self):
+        client = APIClient()
+        response = client.post("/api/token/refresh/", {"refresh": self.token})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+        self.assertNotEqual(response.json()["refresh"], self.token)
+
+        with self.assertNumQueries(0):
+            response = client.post("/api/token/refresh/", {"refresh": self.token})
+        self.assertEqual(response.status_code, 401)
+
+    def test_lru_evicts_oldest_entry(self):
+        cache = BlacklistCache(max_size=2)
+        expires_at = aware_utcnow().timestamp() + 60
+        for jti in ("a", "b", "c"):
+            cache.set(jti, True, expires_at)
+        self.assertIsNone(cache.get("a"))
+        self.assertTrue(cache.get("c"))
+
+
+class PruneTokensCommandTestCases(TestCase):
+    def test_deletes_only_expired_tokens(self):
+        user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        for _ in range(3):
+            RefreshToken.for_user(user).blacklist()
+        live = RefreshToken.for_user(user)
+        OutstandingToken.objects.exclude(jti=live["jti"]).update(
+            expires_at=aware_utcnow() - datetime.timedelta(days=1)
+        )
+
+        out = StringIO()
+        call_command("prune_tokens", batch_size=2, stdout=out)
+
+        self.assertIn("Pruned 3 expired tokens", out.getvalue())
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list("jti", flat=True)),
+            [live["jti"]],
+        )
+        self.assertFalse(BlacklistedToken.objects.exists())
@@ -0,0 +1,90 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from ..models import Notification, UserModel
+from ..tasks import create_notifications
+from ..views import NotificationModelViewSet
+
+
+class UnreadNotificationCounterTestCases(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def unread_count(self):
+        self.user.refresh_from_db(fields=["unread_notification_count"])
+        return self.user.unread_notification_count
+
+    def test_counter_follows_notification_changes(self):
+        create_notifications([(self.user.id, "First"), (self.user.id, "Second")])
+        self.assertEqual(self.unread_count(), 2)
+
+        notification = Notification.objects.create(text="Third", user=self.user)
+        self.assertEqual(self.unread_count(), 3)
+
+        notification.mark_read = True
+        notification.save(update_fields=["mark_read"])
+        self.assertEqual(self.unread_count(), 2)
+
+        notification.save()
+        self.assertEqual(self.unread_count(), 2)
+
+        Notification.objects.filter(mark_read=False).first().delete()
+        self.assertEqual(self.unread_count(), 1)
+
+        self.client.post("/api/notifications/mark_read/")
+        self.assertEqual(self.unread_count(), 0)
+
+    def test_concurrent_mark_read_counts_once(self):
+        create_notifications([(self.user.id, "First"), (self.user.id, "Second")])
+        notification = Notification.objects.order_by("id").first()
+        url = f"/api/notifications/{notification.id}/true/"
+
+        self.client.put(url)
+        self.assertEqual(self.unread_count(), 1)
+
+        # A second request that loaded the row before the first marked it.
+        notification.mark_read = False
+        with mock.patch.object(
+            NotificationModelViewSet, "get_object", return_value=notification
+        ):
+            response = self.client.put(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.unread_count(), 1)
+
+        self.client.put(f"/api/notifications/{notification.id}/false/")
+        self.assertEqual(self.unread_count(), 2)
+
+    def test_unread_count_endpoint_and_user_response(self):
+        create_notifications([(self.user.id, "First")])
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/notifications/unread_count/")
+        self.assertEqual(response.json()["unread_count"], 1)
+
+        self.user.refresh_from_db()
+        response = self.client.get("/api/user/")
+        self.assertEqual(response.json()["user"]["unread_notification_count"], 1)
+
+    def test_reconcile_command(self):
+        Notification.objects.bulk_create(
+            Notification(text=str(i), user=self.user, mark_read=i == 0)
+            for i in range(3)
+        )
+        self.assertEqual(self.unread_count(), 0)
+
+        out = StringIO()
+        call_command("reconcile_unread_counts", batch_size=1, stdout=out)
+
+        self.assertEqual(self.unread_count(), 2)
+        self.assertIn("Reconciled 1 unread notification counters", out.getvalue())
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Project, Task, Timeline, UserModel
+
+
+class ExportTestCases(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = Project.objects.create(
+                title="Test Project",
+                description="abc",
+                start_date="2021-09-01",
+                end_date="2024-09-30",
+            )
+            for i in range(3):
+                Task.objects.create(
+                    title=f"Task, {i}",
+                    description="abc",
+                    status="open",
+                    project=self.project,
+                    assignee=self.user,
+                )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_timeline_ndjson_export(self):
+        response = self.client.get(f"/api/timeline/{self.project.id}/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(len(rows), Timeline.objects.count())
+        self.assertEqual(list(rows[0]), ["id", "project", "event_type", "time"])
+
+    def test_task_csv_export(self):
+        response = self.client.get("/api/tasks/export/", {"export_format": "csv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('filename="tasks.csv"', response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(
+            rows[0], ["id", "title", "description", "status", "project", "assignee"]
+        )
+        self.assertEqual(
+            [row[1] for row in rows[1:]], ["Task, 0", "Task, 1", "Task, 2"]
+        )
+
+    def test_invalid_export_format(self):
+        response = self.client.get("/api/tasks/export/", {"export_format": "xml"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_project(self):
+        response = self.client.get("/api/timeline/0/export/")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_asgi_export_streams_asynchronously(self):
+        response = await self.async_client.get(
+            "/api/tasks/export/",
+            {"export_format": "csv"},
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        rows = list(csv.reader(io.StringIO(content.decode())))
+        self.assertEqual(
+            [row[1] for row in rows[1:]], ["Task, 0", "Task, 1", "Task, 2"]
+        )
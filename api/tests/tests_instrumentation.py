@@ -0,0 +1,107 @@
+import re
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..instrumentation import collect, registry, reset_metrics
+from ..models import Project, UserModel
+from ..serializers import ProjectSerializer
+
+
+def server_timing(response):
+    return {
+        name: (float(duration), desc)
+        for name, duration, desc in re.findall(
+            r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', response["Server-Timing"]
+        )
+    }
+
+
+# Every request has to reach the view, not the response cache.
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class RequestMetricsTestCases(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_metrics()
+        self.user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        for i in range(3):
+            project = Project.objects.create(
+                title=f"Project {i}",
+                description="abc",
+                start_date="2021-09-01",
+                end_date="2024-09-30",
+            )
+            project.team_members.add(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_header(self):
+        with self.assertNumQueries(2) as captured:
+            response = self.client.get("/api/projects/")
+        timing = server_timing(response)
+
+        self.assertEqual(set(timing), {"db", "serialize", "render", "total"})
+        self.assertEqual(timing["db"][1], f"{len(captured.captured_queries)} queries")
+        # Team members are prefetched, so serializing runs no queries.
+        self.assertEqual(timing["serialize"][1], "0 queries")
+        self.assertGreaterEqual(timing["total"][0], timing["db"][0])
+
+    def test_streaming_responses_are_recorded_once_consumed(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/tasks/export/")
+            # Sent before the body, so it couldn't include the export query.
+            self.assertNotIn("Server-Timing", response)
+            self.assertNotIn("GET task_export", registry.routes)
+            b"".join(response.streaming_content)
+
+        histograms = registry.routes["GET task_export"].histograms
+        self.assertEqual(histograms["queries"].count, 1)
+        self.assertEqual(histograms["queries"].total, len(queries))
+
+    async def test_async_streaming_responses_are_recorded_once_consumed(self):
+        response = await self.async_client.get(
+            "/api/tasks/export/",
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"},
+        )
+        self.assertTrue(response.is_async)
+        [chunk async for chunk in response.streaming_content]
+
+        histograms = registry.routes["GET task_export"].histograms
+        # The user and the export.
+        self.assertEqual(histograms["queries"].total, 2)
+
+    def test_queries_while_serializing_are_counted(self):
+        with collect() as metrics:
+            ProjectSerializer(Project.objects.all(), many=True).data
+        # One query for the projects and one per project for its members.
+        self.assertEqual(metrics.queries, 4)
+        self.assertEqual(metrics.serializer_queries, 4)
+
+    def test_request_metrics_command(self):
+        for _ in range(3):
+            self.client.get("/api/projects/")
+        self.client.get("/api/tasks/")
+        registry.flush()
+
+        out = StringIO()
+        call_command("request_metrics", "--sort", "requests", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[1].startswith("GET projects-list"))
+        self.assertEqual(lines[1].split()[2], "3")
+        self.assertTrue(lines[2].startswith("GET tasks-list"))
+
+        call_command("request_metrics", "--reset", stdout=StringIO())
+        out = StringIO()
+        call_command("request_metrics", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "No request metrics collected yet")
@@ -241,12 +241,14 @@ class TimelineTestCase(TestCase):
             password="password123",
             password2="password123",
         )
-        self.project = Project.objects.create(
-            title="Test Project",
-            description="Test Description",
-            start_date="2021-09-01",
-            end_date="2024-09-30",
-        )
+        # Timeline events are written when the transaction commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = Project.objects.create(
+                title="Test Project",
+                description="Test Description",
+                start_date="2021-09-01",
+                end_date="2024-09-30",
+            )
         self.timeline = Timeline.objects.create(
             project=self.project, event_type="created"
         )
@@ -262,13 +264,14 @@ class TimelineTestCase(TestCase):
         )
 
     def test_new_timeline(self):
-        Task.objects.create(
-            title="Test Task",
-            description="Test Task Description",
-            status="open",
-            project=self.project,
-            assignee=self.user,
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(
+                title="Test Task",
+                description="Test Task Description",
+                status="open",
+                project=self.project,
+                assignee=self.user,
+            )
 
         self.assertEqual(Timeline.objects.count(), 3)
 
@@ -323,3 +326,35 @@ class NotificationTestCase(TestCase):
         self.task.assignee = user
         self.task.save()
         self.assertEqual(Notification.objects.count(), 2)
+
+    def test_task_assignment_notification_without_extra_query(self):
+        user = UserModel.objects.create_user(
+            username="testuser",
+            email="newuser@example.com",
+            password="password123",
+            password2="password123",
+        )
+        task = Task.objects.get(id=self.task.id)
+        task.assignee = user
+        self.assertEqual(task.changed_fields, ["assignee"])
+
+        # UPDATE of the task, INSERT of the notification and UPDATE of the
+        # assignee's unread counter only.
+        with self.assertNumQueries(3):
+            task.save()
+        self.assertEqual(Notification.objects.filter(user=user).count(), 1)
+        self.assertEqual(task.changed_fields, [])
+
+        task.title = "Renamed Task"
+        task.save()
+        self.assertEqual(Notification.objects.filter(user=user).count(), 1)
+
+    def test_no_notification_on_task_creation(self):
+        Task.objects.create(
+            title="Another Task",
+            description="Test Task Description",
+            status="open",
+            project=self.project,
+            assignee=self.user,
+        )
+        self.assertEqual(Notification.objects.count(), 1)
@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Profile, UserModel
+from ..permissions import IsManager
+from ..utils import generate_image
+
+
+class IsManagerTestCases(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        self.profile = Profile.objects.create(
+            user=self.user,
+            profile_picture=generate_image(),
+            roles="manager",
+            contact_number="03001234567",
+        )
+
+    def has_permission(self, user, token=None):
+        request = self.factory.post("/")
+        force_authenticate(request, user=user, token=token)
+        request = APIView().initialize_request(request)
+        return IsManager().has_permission(request, None)
+
+    def test_role_lookup_is_cached(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(self.has_permission(self.user))
+        with self.assertNumQueries(0):
+            self.assertTrue(self.has_permission(self.user))
+
+    def test_profile_save_invalidates_cached_role(self):
+        self.assertTrue(self.has_permission(self.user))
+        self.profile.roles = "developer"
+        self.profile.save()
+        self.assertFalse(self.has_permission(self.user))
+
+    def test_user_without_profile_is_denied(self):
+        other = UserModel.objects.create_user(
+            username="test1",
+            email="test1@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        self.assertFalse(self.has_permission(other))
+        with self.assertNumQueries(0):
+            self.assertFalse(self.has_permission(other))
+
+    def test_role_claim_of_older_tokens_is_ignored(self):
+        # Tokens issued before the claim was dropped still carry it.
+        token = AccessToken.for_user(self.user)
+        token["role"] = "manager"
+        self.profile.roles = "developer"
+        self.profile.save()
+        self.assertFalse(self.has_permission(self.user, token))
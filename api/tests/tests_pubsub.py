@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import suppress
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Notification, UserModel
+from ..pubsub import InProcessBroker, get_broker
+from ..tasks import create_notifications
+
+
+class InProcessBrokerTestCases(TestCase):
+    async def test_publish_reaches_subscribers_of_the_user(self):
+        broker = InProcessBroker()
+        async with broker.subscribe(1) as first, broker.subscribe(2) as second:
+            # Published from another thread, as a sync view would.
+            await sync_to_async(broker.publish, thread_sensitive=False)(1, "hello")
+            self.assertEqual(await first.get(1), "hello")
+            self.assertIsNone(await second.get(0.01))
+        self.assertEqual(dict(broker._subscribers), {})
+
+    async def test_slow_subscriber_drops_messages(self):
+        broker = InProcessBroker(queue_size=1)
+        async with broker.subscribe(1) as subscription:
+            broker.publish(1, "first")
+            broker.publish(1, "second")
+            await asyncio.sleep(0)
+            self.assertEqual(await subscription.get(1), "first")
+            self.assertIsNone(await subscription.get(0.01))
+
+
+@override_settings(NOTIFICATION_STREAM_KEEPALIVE=0.01)
+class NotificationStreamTestCases(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        self.token = str(AccessToken.for_user(self.user))
+
+    def notify(self, text):
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(text=text, user=self.user)
+            create_notifications([(self.user.id, f"{text} (bulk)")])
+
+    async def disconnect(self, events):
+        # Cancel a pending read, as the ASGI handler does when the client leaves.
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with suppress(asyncio.CancelledError):
+            await pending
+        self.assertEqual(dict(get_broker()._subscribers), {})
+
+    async def test_stream_pushes_new_notifications(self):
+        response = await self.async_client.get(
+            "/api/notifications/stream/",
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = aiter(response.streaming_content)
+        self.assertEqual(await anext(events), b"retry: 5000\n\n")
+        self.assertEqual(await anext(events), b": keepalive\n\n")
+
+        await sync_to_async(self.notify)("Hello")
+
+        single = await anext(events)
+        bulk = await anext(events)
+        self.assertIn(b"event: notification\n", single)
+        self.assertIn(b'"text":"Hello"', single)
+        self.assertIn(b'"text":"Hello (bulk)"', bulk)
+        await self.disconnect(events)
+
+    async def test_token_query_parameter(self):
+        response = await self.async_client.get(
+            f"/api/notifications/stream/?token={self.token}"
+        )
+        self.assertEqual(response.status_code, 200)
+        events = aiter(response.streaming_content)
+        self.assertEqual(await anext(events), b"retry: 5000\n\n")
+        await self.disconnect(events)
+
+    async def test_stream_requires_valid_token(self):
+        response = await self.async_client.get("/api/notifications/stream/")
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get("/api/notifications/stream/?token=bad")
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_requires_asgi(self):
+        response = self.client.get(
+            "/api/notifications/stream/",
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+        self.assertEqual(response.status_code, 501)
@@ -0,0 +1,88 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from ..counters import reconcile_unread_counts
+from ..models import Comment, Document, Notification, Project, Task, UserModel
+from ..seeding import seed_dataset
+from .query_budget import QueryBudgetMixin
+
+# Rows added by each grow(1).
+VOLUMES = {
+    "users": 5,
+    "projects": 3,
+    "documents": 4,
+    "tasks": 20,
+    "comments": 20,
+    "timeline": 20,
+    "notifications": 20,
+}
+
+READ_ENDPOINTS = (
+    "/api/projects/",
+    "/api/projects/{project}/",
+    "/api/tasks/",
+    "/api/tasks/{task}/",
+    "/api/tasks/export/",
+    "/api/documents/",
+    "/api/documents/{document}/",
+    "/api/comments/",
+    "/api/comments/{comment}/",
+    "/api/notifications/",
+    "/api/notifications/unread_count/",
+    "/api/timeline/{project}/",
+    "/api/timeline/{project}/export/",
+    "/api/user/",
+)
+
+
+# Every request has to reach the database.
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class QueryCountScalingTestCases(QueryBudgetMixin, APITestCase):
+    def grow(self, scale):
+        seed_dataset(
+            **{name: count * scale for name, count in VOLUMES.items()},
+            batch_size=100,
+        )
+        # The manager sees every project and gets every notification, so the
+        # rows each endpoint returns grow with the dataset.
+        manager = UserModel.objects.order_by("id").first()
+        membership = Project.team_members.through
+        membership.objects.bulk_create(
+            (
+                membership(project_id=project_id, usermodel_id=manager.id)
+                for project_id in Project.objects.values_list("id", flat=True)
+            ),
+            ignore_conflicts=True,
+        )
+        Notification.objects.update(user=manager)
+        reconcile_unread_counts([manager.id])
+        return manager
+
+    def query_counts(self, manager):
+        ids = {
+            "project": Project.objects.order_by("id").first().id,
+            "task": Task.objects.order_by("id").first().id,
+            "document": Document.objects.order_by("id").first().id,
+            "comment": Comment.objects.order_by("id").first().id,
+        }
+        counts = {}
+        for url in READ_ENDPOINTS:
+            url = url.format(**ids)
+            # A fresh user per request, as authentication loads in production.
+            self.client.force_authenticate(UserModel.objects.get(pk=manager.pk))
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            self.assertEqual(response.status_code, 200, url)
+            counts[url] = len(queries)
+        return counts
+
+    def test_query_counts_do_not_grow_with_the_dataset(self):
+        manager = self.grow(1)
+        small = self.query_counts(manager)
+
+        self.grow(9)
+        self.assertEqual(self.query_counts(manager), small)
@@ -0,0 +1,81 @@
+import datetime
+import decimal
+import io
+import uuid
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from ..models import Task
+from ..parsers import FastJSONParser
+from ..renderers import FastJSONRenderer
+from ..serializers import TaskSerializer
+
+
+class FastJSONRendererTestCases(SimpleTestCase):
+    def assertSameOutput(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_matches_json_renderer(self):
+        self.assertSameOutput(
+            {
+                "time": timezone.make_aware(
+                    datetime.datetime(2024, 9, 1, 12, 30, 15, 123456),
+                    datetime.timezone.utc,
+                ),
+                "naive": datetime.datetime(2024, 9, 1, 12, 30),
+                "date": datetime.date(2024, 9, 1),
+                "decimal": decimal.Decimal("1.50"),
+                "uuid": uuid.UUID(int=1),
+                "lazy": gettext_lazy("Enter a valid value."),
+                "error": ErrorDetail("Invalid", code="invalid"),
+                "text": "caf\u00e9 \u2028 \u2029 \U0001f600",
+                "numbers": [0, -1, 2.5, True, None],
+            }
+        )
+
+    def test_matches_json_renderer_for_serializer_output(self):
+        tasks = [
+            Task(
+                id=i,
+                title=f"Task {i}",
+                description="abc",
+                status="open",
+                project_id=1,
+                assignee_id=2,
+            )
+            for i in range(3)
+        ]
+        self.assertSameOutput(TaskSerializer(tasks, many=True).data)
+
+    def test_non_str_keys_and_big_integers(self):
+        self.assertSameOutput({1: "a", None: "b", 1.5: "c"})
+        self.assertSameOutput({"id": 2**70})
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({"object": object()})
+
+    def test_indented_output_falls_back(self):
+        self.assertSameOutput({"a": [1, 2]}, "application/json; indent=4")
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+
+class FastJSONParserTestCases(SimpleTestCase):
+    def test_matches_json_parser(self):
+        body = '{"title": "café", "ids": [1, 2], "done": false}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"title": '))
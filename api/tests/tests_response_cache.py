@@ -0,0 +1,142 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from ..models import Project, Task, UserModel
+
+
+class ResponseCacheTestBase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        self.other_user = UserModel.objects.create_user(
+            username="test1",
+            email="test1@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = Project.objects.create(
+                title="Test Project",
+                description="abc",
+                start_date="2021-09-01",
+                end_date="2024-09-30",
+            )
+            self.project.team_members.add(self.user)
+            self.task = Task.objects.create(
+                title="Test Task",
+                description="abc",
+                status="open",
+                project=self.project,
+                assignee=self.user,
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class ResponseCacheTestCases(ResponseCacheTestBase):
+    def test_repeated_list_is_served_from_cache(self):
+        self.client.get("/api/tasks/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/tasks/")
+        self.assertEqual(response.json()["tasks"][0]["title"], "Test Task")
+
+    def test_cache_is_keyed_by_query_params_and_user(self):
+        self.client.get("/api/tasks/")
+        with self.assertNumQueries(1):
+            self.client.get("/api/tasks/", {"page_size": 1})
+
+        client = APIClient()
+        client.force_authenticate(self.other_user)
+        response = client.get("/api/tasks/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_task_changes_invalidate_both_assignees(self):
+        client = APIClient()
+        client.force_authenticate(self.other_user)
+        self.assertEqual(self.client.get("/api/tasks/").status_code, 200)
+        self.assertEqual(client.get("/api/tasks/").status_code, 404)
+
+        self.task.assignee = self.other_user
+        self.task.save()
+
+        self.assertEqual(self.client.get("/api/tasks/").status_code, 404)
+        self.assertEqual(client.get("/api/tasks/").status_code, 200)
+
+    def test_membership_changes_invalidate_project_lists(self):
+        client = APIClient()
+        client.force_authenticate(self.other_user)
+        self.assertEqual(client.get("/api/projects/").status_code, 404)
+        self.assertEqual(
+            self.client.get("/api/projects/").json()["projects"][0]["team_members"],
+            [self.user.id],
+        )
+
+        self.project.team_members.add(self.other_user)
+
+        self.assertEqual(client.get("/api/projects/").status_code, 200)
+        self.assertEqual(
+            self.client.get("/api/projects/").json()["projects"][0]["team_members"],
+            [self.user.id, self.other_user.id],
+        )
+
+    def test_timeline_writes_invalidate_project_timeline(self):
+        url = f"/api/timeline/{self.project.id}/"
+        self.assertEqual(len(self.client.get(url).json()["timelines"]), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+
+        self.assertEqual(len(self.client.get(url).json()["timelines"]), 3)
+
+
+class ConditionalGetTestCases(ResponseCacheTestBase):
+    def test_matching_etag_returns_not_modified(self):
+        response = self.client.get("/api/tasks/")
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_etag_changes_with_the_resource(self):
+        url = f"/api/tasks/{self.task.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        self.task.status = "review"
+        self.task.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["task"]["status"], "review")
+
+    def test_notifications_etag_changes_on_mark_read(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.assignee = self.other_user
+            self.task.save()
+        client = APIClient()
+        client.force_authenticate(self.other_user)
+        response = client.get("/api/notifications/")
+        notification_id = response.json()["notifications"][0]["id"]
+
+        client.put(f"/api/notifications/{notification_id}/true/")
+
+        response = client.get(
+            "/api/notifications/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_not_found_has_no_etag(self):
+        client = APIClient()
+        client.force_authenticate(self.other_user)
+        response = client.get("/api/tasks/")
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.contrib.auth.hashers import check_password
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models import (
+    Comment,
+    Document,
+    Notification,
+    Profile,
+    Project,
+    Task,
+    Timeline,
+    UserModel,
+)
+
+
+class SeedDataCommandTestCases(TestCase):
+    def seed(self, *args):
+        out = StringIO()
+        call_command(
+            "seed_data",
+            "--users=10",
+            "--projects=4",
+            "--documents=6",
+            "--tasks=20",
+            "--comments=30",
+            "--timeline=5",
+            "--notifications=40",
+            "--batch-size=7",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_seeds_every_model_in_batches(self):
+        out = self.seed("--backfill-timeline")
+
+        self.assertEqual(UserModel.objects.count(), 10)
+        self.assertEqual(Profile.objects.count(), 10)
+        self.assertEqual(Project.objects.count(), 4)
+        self.assertEqual(Document.objects.count(), 6)
+        self.assertEqual(Task.objects.count(), 20)
+        self.assertEqual(Comment.objects.count(), 30)
+        self.assertEqual(Notification.objects.count(), 40)
+        # 5 random events and one "created" event per project, document and task.
+        self.assertEqual(Timeline.objects.count(), 5 + 4 + 6 + 20)
+        self.assertIn("tasks: 7/20", out)
+        self.assertIn("tasks: 20/20", out)
+
+        manager = UserModel.objects.order_by("id").first()
+        self.assertEqual(manager.email, "user0@example.com")
+        self.assertEqual(manager.user_profile.roles, "manager")
+        self.assertTrue(check_password("password", manager.password))
+        for user in UserModel.objects.all():
+            self.assertEqual(
+                user.unread_notification_count,
+                user.notification_user.filter(mark_read=False).count(),
+            )
+
+    def test_seeding_again_adds_to_the_dataset(self):
+        self.seed()
+        self.seed()
+
+        self.assertEqual(UserModel.objects.count(), 20)
+        self.assertEqual(Document.objects.count(), 12)
+        self.assertEqual(Timeline.objects.count(), 10)
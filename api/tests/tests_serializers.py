@@ -0,0 +1,76 @@
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from ..models import Comment, Notification, Project, Task, Timeline, UserModel
+from ..serializers import (
+    CommentSerializer,
+    NotificationSerializer,
+    TaskSerializer,
+    TimelineSerializer,
+    comment_values_serializer,
+    notification_values_serializer,
+    task_values_serializer,
+    timeline_values_serializer,
+)
+
+
+class ValuesSerializerParityTestCases(TestCase):
+    def setUp(self):
+        user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(
+                title="Test Project",
+                description="abc",
+                start_date="2021-09-01",
+                end_date="2024-09-30",
+            )
+            assigned = Task.objects.create(
+                title="Assigned é",
+                description="abc",
+                status="waiting qa",
+                project=project,
+                assignee=user,
+            )
+            Task.objects.create(
+                title="Unassigned",
+                description="",
+                status="open",
+                project=project,
+            )
+            Comment.objects.create(
+                text="Comment", author=user, task=assigned, project=project
+            )
+        Notification.objects.create(text="Read", user=user, mark_read=True)
+
+    def assertParity(self, values_serializer, serializer_class, queryset):
+        queryset = queryset.order_by("-id")
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        rows = values_serializer.values(queryset)
+        actual = JSONRenderer().render(values_serializer.serialize(rows))
+        self.assertEqual(actual, expected)
+        self.assertNotEqual(actual, b"[]")
+
+    def test_task_parity(self):
+        self.assertParity(task_values_serializer, TaskSerializer, Task.objects.all())
+
+    def test_comment_parity(self):
+        self.assertParity(
+            comment_values_serializer, CommentSerializer, Comment.objects.all()
+        )
+
+    def test_timeline_parity(self):
+        self.assertParity(
+            timeline_values_serializer, TimelineSerializer, Timeline.objects.all()
+        )
+
+    def test_notification_parity(self):
+        self.assertParity(
+            notification_values_serializer,
+            NotificationSerializer,
+            Notification.objects.all(),
+        )
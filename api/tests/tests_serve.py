@@ -0,0 +1,142 @@
+import importlib
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from ..models import Document, Project
+from ..utils import generate_file
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class ServeCommandTestCases(SimpleTestCase):
+    def serve(self, *args):
+        out = StringIO()
+        call_command("serve", "--dry-run", *args, stdout=out)
+        return out.getvalue().splitlines()
+
+    @mock.patch.dict("os.environ", {}, clear=True)
+    def test_wsgi_workers_reuse_connections(self):
+        lines = self.serve("--workers", "3", "--threads", "4")
+        self.assertIn("DB_CONN_MAX_AGE=60", lines)
+        self.assertIn("DEBUG=0", lines)
+        self.assertEqual(
+            lines[-1],
+            "gunicorn api_task.wsgi:application --bind 0.0.0.0:8000 --workers 3 "
+            "--timeout 30 --max-requests 1000 --max-requests-jitter 100 --threads 4",
+        )
+
+    @mock.patch.dict("os.environ", {"DB_CONN_MAX_AGE": "60"}, clear=True)
+    @override_settings(NOTIFICATION_BROKER="api.pubsub.RedisBroker")
+    def test_asgi_workers_never_persist_connections(self):
+        lines = self.serve("--mode", "asgi", "--max-requests", "0")
+        self.assertIn("DB_CONN_MAX_AGE=0", lines)
+        self.assertIn("api_task.asgi:application", lines[-1])
+        self.assertIn("--worker-class uvicorn_worker.UvicornWorker", lines[-1])
+        self.assertNotIn("--max-requests", lines[-1])
+
+    def test_asgi_workers_need_a_shared_broker(self):
+        with self.assertRaisesMessage(CommandError, "set REDIS_URL"):
+            self.serve("--mode", "asgi", "--workers", "2")
+        self.assertIn(
+            "--worker-class", self.serve("--mode", "asgi", "--workers", "1")[-1]
+        )
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=300)
+    def test_workers_need_a_shared_response_cache(self):
+        with self.assertRaisesMessage(CommandError, "set REDIS_URL"):
+            self.serve("--workers", "2")
+        self.assertIn("--workers 1", self.serve("--workers", "1")[-1])
+
+
+# As under `manage.py serve`, which turns DEBUG off.
+@override_settings(DEBUG=False, SERVE_FILES=True)
+class StaticFilesTestCases(SimpleTestCase):
+    path = "/static/admin/css/base.css"
+
+    def load(self, name):
+        # The module wraps its application when imported.
+        return importlib.reload(importlib.import_module(name)).application
+
+    def test_wsgi_application_serves_static_files(self):
+        application = self.load("api_task.wsgi")
+
+        statuses = []
+        environ = RequestFactory().get(self.path).environ
+        response = application(environ, lambda status, headers: statuses.append(status))
+        response.close()
+        self.assertEqual(statuses, ["200 OK"])
+
+    @mock.patch.dict("os.environ")
+    async def test_asgi_application_serves_static_files(self):
+        # Importing it turns ASYNC_VIEWS on in the environment.
+        application = self.load("api_task.asgi")
+
+        communicator = ApplicationCommunicator(
+            application,
+            {
+                "type": "http",
+                "method": "GET",
+                "path": self.path,
+                "query_string": b"",
+                "headers": [],
+            },
+        )
+        await communicator.send_input({"type": "http.request", "body": b""})
+        start = await communicator.receive_output()
+        self.assertEqual(start["status"], 200)
+        await communicator.wait()
+
+    @mock.patch.dict("os.environ")
+    @override_settings(SERVE_FILES=False)
+    def test_static_files_left_to_the_web_server_by_default(self):
+        self.assertIsInstance(self.load("api_task.wsgi"), WSGIHandler)
+        self.assertIsInstance(self.load("api_task.asgi"), ASGIHandler)
+
+
+@override_settings(
+    DEBUG=False,
+    SERVE_FILES=True,
+    STORAGES={
+        **settings.STORAGES,
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    },
+)
+class MediaFilesTestCases(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        project = Project.objects.create(
+            title="Test Project",
+            description="abc",
+            start_date="2021-09-01",
+            end_date="2024-09-30",
+        )
+        self.document = Document.objects.create(
+            name="Messages.txt",
+            description="abc",
+            file=generate_file(),
+            version=1,
+            project=project,
+        )
+
+    def test_uploaded_files_are_served(self):
+        response = self.client.get(self.document.file.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            b"".join(response.streaming_content), b"This is a dummy file for testing."
+        )
+
+    @override_settings(SERVE_FILES=False)
+    def test_uploaded_files_left_to_the_web_server(self):
+        response = self.client.get(self.document.file.url)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from ..models import Notification, Project, Task, Timeline, UserModel
+from ..tasks import create_notifications, write_timeline_events
+
+
+@override_settings(ASYNC_SIDE_EFFECTS=True)
+class AsyncSideEffectsTestCases(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="testuser",
+            email="testuser@gmail.com",
+            password="password123",
+            password2="password123",
+        )
+        self.other_user = UserModel.objects.create_user(
+            username="testuser2",
+            email="testuser2@gmail.com",
+            password="password123",
+            password2="password123",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = Project.objects.create(
+                title="Test Project",
+                description="Test Description",
+                start_date="2021-09-01",
+                end_date="2024-09-30",
+            )
+            Task.objects.create(
+                title="Test Task",
+                description="Test Task Description",
+                status="open",
+                project=self.project,
+                assignee=self.user,
+            )
+        self.task = Task.objects.get(title="Test Task")
+
+    def test_assignment_notification_is_queued_on_commit(self):
+        with mock.patch.object(create_notifications, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.task.assignee = self.other_user
+                self.task.save()
+                delay.assert_not_called()
+
+        delay.assert_called_once_with(
+            [
+                (
+                    self.other_user.id,
+                    'New task "Test Task" has been assigned to you',
+                )
+            ]
+        )
+        self.assertEqual(Notification.objects.count(), 0)
+
+    def test_timeline_events_are_queued_as_one_job(self):
+        with mock.patch.object(write_timeline_events, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.task.title = "Renamed Task"
+                self.task.save()
+                self.task.delete()
+
+        delay.assert_called_once_with(
+            [(self.project.id, "updated"), (self.project.id, "deleted")]
+        )
+
+    def test_eager_mode_runs_jobs_in_process(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.assignee = self.other_user
+            self.task.save()
+
+        self.assertEqual(Notification.objects.filter(user=self.other_user).count(), 1)
+        self.assertEqual(Timeline.objects.filter(event_type="updated").count(), 1)
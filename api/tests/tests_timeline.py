@@ -0,0 +1,142 @@
+from asgiref.sync import iscoroutinefunction
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+
+from ..middleware import TimelineBufferMiddleware
+from ..models import Project, Task, Timeline, UserModel
+from ..timeline import timeline_buffer
+
+
+# The response cache registers on_commit callbacks of its own.
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class TimelineBufferTestCases(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="testuser",
+            email="testuser@gmail.com",
+            password="password123",
+            password2="password123",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = Project.objects.create(
+                title="Test Project",
+                description="Test Description",
+                start_date="2021-09-01",
+                end_date="2024-09-30",
+            )
+
+    def create_task(self, title="Test Task"):
+        return Task.objects.create(
+            title=title,
+            description="Test Task Description",
+            status="open",
+            project=self.project,
+            assignee=self.user,
+        )
+
+    def test_events_flushed_in_one_insert_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with timeline_buffer():
+                for i in range(3):
+                    self.create_task(f"Task {i}")
+        self.assertEqual(Timeline.objects.count(), 1)
+
+        with self.assertNumQueries(1):
+            for callback in callbacks:
+                callback()
+        self.assertEqual(Timeline.objects.count(), 4)
+
+    def test_events_buffered_per_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.create_task("Task 1")
+            self.create_task("Task 2")
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(Timeline.objects.count(), 1)
+
+        callbacks[0]()
+        self.assertEqual(
+            Timeline.objects.filter(event_type="created").count(),
+            3,
+        )
+
+    def test_rolled_back_events_are_discarded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.create_task()
+                    raise ValueError
+            except ValueError:
+                pass
+            self.create_task("Committed Task")
+        self.assertEqual(Timeline.objects.count(), 2)
+
+    def test_rolled_back_events_are_discarded_inside_a_request(self):
+        def view(request):
+            try:
+                with transaction.atomic():
+                    self.create_task()
+                    raise ValueError
+            except ValueError:
+                pass
+            self.create_task("Committed Task")
+            return HttpResponse()
+
+        middleware = TimelineBufferMiddleware(view)
+        with self.captureOnCommitCallbacks(execute=True):
+            middleware(RequestFactory().post("/api/tasks/"))
+        self.assertEqual(
+            list(Timeline.objects.values_list("event_type", flat=True)),
+            ["created", "created"],
+        )
+
+    def test_blocks_without_savepoint_share_the_enclosing_buffer(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                self.create_task("Task 1")
+                with transaction.atomic(savepoint=False):
+                    self.create_task("Task 2")
+        self.assertEqual(len(callbacks), 1)
+
+        callbacks[0]()
+        self.assertEqual(Timeline.objects.count(), 3)
+
+    @override_settings(TIMELINE_BUFFERED_WRITES=False)
+    def test_immediate_writes(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.create_task()
+        self.assertEqual(callbacks, [])
+        self.assertEqual(Timeline.objects.count(), 2)
+
+    def test_delete_project_with_tasks(self):
+        self.create_task()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(Project.objects.count(), 0)
+        self.assertEqual(Timeline.objects.count(), 0)
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class AsyncTimelineBufferTestCases(TransactionTestCase):
+    async def test_async_request_buffers_events_of_sync_code(self):
+        user = await UserModel.objects.acreate(email="test@gmail.com")
+        # Outside any transaction or scope: written right away.
+        project = await Project.objects.acreate(
+            title="Test Project",
+            description="abc",
+            start_date="2021-09-01",
+            end_date="2024-09-30",
+        )
+
+        async def view(request):
+            for i in range(2):
+                await Task.objects.acreate(
+                    title=f"Task {i}", project=project, assignee=user
+                )
+            self.assertEqual(await Timeline.objects.acount(), 1)
+            return HttpResponse()
+
+        middleware = TimelineBufferMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(RequestFactory().post("/api/tasks/"))
+        self.assertEqual(await Timeline.objects.acount(), 3)
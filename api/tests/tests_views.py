@@ -1,11 +1,25 @@
+import datetime
+from unittest import mock
+
 from django.urls import reverse
 from rest_framework.test import APIClient, APITestCase
 
-from ..models import Comment, Document, Profile, Project, Task, UserModel
+from ..models import (
+    Comment,
+    Document,
+    Notification,
+    Profile,
+    Project,
+    Task,
+    Timeline,
+    UserModel,
+)
+from ..serializers import TaskBulkUpdateListSerializer
 from ..utils import generate_file, generate_image
+from .query_budget import QueryBudgetMixin
 
 
-class AuthenticationTestCases(APITestCase):
+class AuthenticationTestCases(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.auth_client = APIClient()
         image = generate_image()
@@ -42,7 +56,7 @@ class AuthenticationTestCases(APITestCase):
         response = self.un_auth_client.post(reverse("register"), data)
         response_data = response.json()
         self.assertEqual(
-            response_data["error"]["email"][0], "user with this Email already exists."
+            response_data["error"], "email: user with this Email already exists."
         )
 
         image = generate_image()
@@ -74,7 +88,7 @@ class AuthenticationTestCases(APITestCase):
         self.assertEqual(response_data["message"], "User logout successfully")
 
 
-class ProjectTestCases(APITestCase):
+class ProjectTestCases(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.auth_client = APIClient()
         self.un_auth_client = APIClient()
@@ -123,7 +137,8 @@ class ProjectTestCases(APITestCase):
             "title": "Test Project",
             "description": "abc",
             "start_date": "2021-09-01",
-            "end_date": "2024-09-30",
+            # Validated as a future date.
+            "end_date": str(datetime.date.today() + datetime.timedelta(days=30)),
             "team_members": [2],
         }
 
@@ -142,6 +157,37 @@ class ProjectTestCases(APITestCase):
         response_data = response.json()
         self.assertEqual(len(response_data["projects"]), 1)
 
+    def test_get_project_api_query_count(self):
+        developer = UserModel.objects.get(email="test1@gmail.com")
+        client = APIClient()
+        client.force_authenticate(developer)
+
+        with self.assertNumQueries(2):
+            response = client.get("/api/projects/")
+        self.assertEqual(len(response.json()["projects"]), 1)
+
+        for i in range(10):
+            project = Project.objects.create(
+                title=f"Project {i}",
+                description="abc",
+                start_date="2021-09-01",
+                end_date="2024-09-30",
+            )
+            project.team_members.add(developer, self.user)
+        Project.objects.create(
+            title="Other Project",
+            description="abc",
+            start_date="2021-09-01",
+            end_date="2024-09-30",
+        )
+
+        with self.assertNumQueries(2):
+            response = client.get("/api/projects/")
+        projects = response.json()["projects"]
+        self.assertEqual(len(projects), 11)
+        members = {p["title"]: sorted(p["team_members"]) for p in projects}
+        self.assertEqual(members["Project 9"], [1, 2])
+
     def test_get_project_details_api(self):
 
         response = self.auth_client.get("/api/projects/1/")
@@ -162,7 +208,7 @@ class ProjectTestCases(APITestCase):
         self.assertEqual(response_data["message"], "Project deleted successfully")
 
 
-class TaskTestCases(APITestCase):
+class TaskTestCases(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.auth_client = APIClient()
         self.un_auth_client = APIClient()
@@ -267,7 +313,170 @@ class TaskTestCases(APITestCase):
         self.assertEqual(response_data["message"], "Task deleted successfully")
 
 
-class TaskAssignTestCase(APITestCase):
+class TaskBulkTestCases(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.auth_client = APIClient()
+        self.user = UserModel.objects.create_user(
+            username="test",
+            email="test@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        self.developer = UserModel.objects.create_user(
+            username="test1",
+            email="test1@gmail.com",
+            password="12345",
+            password2="12345",
+        )
+        Profile.objects.create(
+            user=self.user,
+            profile_picture=generate_image(),
+            roles="manager",
+            contact_number="03001234567",
+        )
+        self.auth_client.force_authenticate(self.user)
+        self.project = Project.objects.create(
+            title="Test Project",
+            description="abc",
+            start_date="2021-09-01",
+            end_date="2024-09-30",
+        )
+
+    def task_data(self, i, **extra):
+        return {
+            "title": f"Task {i}",
+            "description": "abc",
+            "status": "open",
+            "project": self.project.id,
+            **extra,
+        }
+
+    def test_bulk_create_tasks_api(self):
+        data = [self.task_data(i, assignee=self.developer.id) for i in range(3)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.auth_client.post("/api/tasks/bulk/", data, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()["tasks"]), 3)
+        self.assertEqual(Task.objects.filter(assignee=self.developer).count(), 3)
+        self.assertEqual(
+            Timeline.objects.filter(project=self.project, event_type="created").count(),
+            3,
+        )
+
+    def test_bulk_create_rejects_unknown_ids(self):
+        data = [self.task_data(0), self.task_data(1, assignee=0)]
+
+        response = self.auth_client.post("/api/tasks/bulk/", data, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["error"],
+            'assignee: Invalid pk "0" - object does not exist.',
+        )
+        self.assertFalse(Task.objects.exists())
+
+    def test_bulk_create_reports_item_errors(self):
+        data = [self.task_data(0), self.task_data(1, status="done")]
+
+        response = self.auth_client.post("/api/tasks/bulk/", data, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()["error"].startswith("1: status:"))
+
+    def test_bulk_update_tasks_api(self):
+        tasks = Task.objects.bulk_create(
+            Task(
+                title=f"Task {i}",
+                description="abc",
+                status="open",
+                project=self.project,
+            )
+            for i in range(3)
+        )
+        data = [
+            {"id": tasks[0].id, "status": "review"},
+            {"id": tasks[1].id, "assignee": self.developer.id},
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.auth_client.patch("/api/tasks/bulk/", data, format="json")
+        self.assertEqual(response.status_code, 200)
+        tasks = Task.objects.in_bulk([task.id for task in tasks])
+        self.assertEqual(
+            [task.status for task in tasks.values()], ["review", "open", "open"]
+        )
+        self.assertEqual(
+            [task.assignee_id for task in tasks.values()],
+            [None, self.developer.id, None],
+        )
+        self.assertEqual(
+            list(Notification.objects.values_list("user_id", "text")),
+            [(self.developer.id, 'New task "Task 1" has been assigned to you')],
+        )
+        self.assertEqual(Timeline.objects.filter(event_type="updated").count(), 2)
+
+    def test_bulk_update_skips_unchanged_tasks(self):
+        tasks = Task.objects.bulk_create(
+            Task(
+                title=f"Task {i}",
+                description="abc",
+                status="open",
+                project=self.project,
+            )
+            for i in range(2)
+        )
+        data = [
+            {"id": tasks[0].id, "status": "open", "assignee": None},
+            {"id": tasks[1].id, "status": "review"},
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.auth_client.patch("/api/tasks/bulk/", data, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [task["id"] for task in response.json()["tasks"]],
+            [task.id for task in tasks],
+        )
+        self.assertEqual(Timeline.objects.filter(event_type="updated").count(), 1)
+
+    def test_bulk_update_rejects_tasks_deleted_after_validation(self):
+        tasks = Task.objects.bulk_create(
+            Task(
+                title=f"Task {i}",
+                description="abc",
+                status="open",
+                project=self.project,
+            )
+            for i in range(2)
+        )
+        deleted = tasks[1].id
+        validate = TaskBulkUpdateListSerializer.validate
+
+        def validate_then_delete(serializer, attrs):
+            attrs = validate(serializer, attrs)
+            tasks[1].delete()
+            return attrs
+
+        data = [{"id": task.id, "status": "review"} for task in tasks]
+        with mock.patch.object(
+            TaskBulkUpdateListSerializer, "validate", validate_then_delete
+        ):
+            response = self.auth_client.patch("/api/tasks/bulk/", data, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["error"],
+            f'id: Invalid pk "{deleted}" - object does not exist.',
+        )
+        self.assertEqual(Task.objects.get(pk=tasks[0].id).status, "open")
+
+    def test_bulk_endpoints_require_manager(self):
+        client = APIClient()
+        client.force_authenticate(self.developer)
+
+        response = client.post("/api/tasks/bulk/", [self.task_data(0)], format="json")
+        self.assertEqual(response.status_code, 403)
+
+
+class TaskAssignTestCase(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.auth_client = APIClient()
         self.un_auth_client = APIClient()
@@ -354,7 +563,7 @@ class TaskAssignTestCase(APITestCase):
         self.assertEqual(response_data["message"], "Task assigned successfully")
 
 
-class DocumentTestCases(APITestCase):
+class DocumentTestCases(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.auth_client = APIClient()
         self.un_auth_client = APIClient()
@@ -403,8 +612,8 @@ class DocumentTestCases(APITestCase):
         response = self.auth_client.post("/api/documents/", data)
         response_data = response.json()
         self.assertEqual(
-            response_data["error"]["version"][0],
-            "document with this Version already exists.",
+            response_data["error"],
+            "version: document with this Version already exists.",
         )
 
         data["version"] = 2
@@ -443,7 +652,7 @@ class DocumentTestCases(APITestCase):
         self.assertEqual(response_data["message"], "Document deleted successfully")
 
 
-class CommentTestCases(APITestCase):
+class CommentTestCases(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.auth_client = APIClient()
         self.un_auth_client = APIClient()
@@ -510,6 +719,30 @@ class CommentTestCases(APITestCase):
 
         response.data = response.json()
         self.assertEqual(len(response.data["comments"]), 1)
+        self.assertIsNone(response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+    def test_paginate_comments_api(self):
+        task = Task.objects.get(id=1)
+        for i in range(4):
+            Comment.objects.create(
+                text=f"comment {i}", author=self.user, project=task.project, task=task
+            )
+
+        response = self.auth_client.get("/api/comments/", {"page_size": 2})
+        response_data = response.json()
+        self.assertEqual([c["id"] for c in response_data["comments"]], [5, 4])
+        self.assertIsNone(response_data["previous"])
+
+        response = self.auth_client.get(response_data["next"])
+        response_data = response.json()
+        self.assertEqual([c["id"] for c in response_data["comments"]], [3, 2])
+
+        response = self.auth_client.get(response_data["next"])
+        response_data = response.json()
+        self.assertEqual([c["id"] for c in response_data["comments"]], [1])
+        self.assertIsNone(response_data["next"])
+        self.assertIsNotNone(response_data["previous"])
 
     def test_get_comment_details_api(self):
         response = self.auth_client.get("/api/comments/2/")
@@ -543,7 +776,7 @@ class CommentTestCases(APITestCase):
         self.assertEqual(response_data["message"], "Comment deleted successfully")
 
 
-class TimelineTestCases(APITestCase):
+class TimelineTestCases(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.auth_client = APIClient()
         image = generate_image()
@@ -562,13 +795,15 @@ class TimelineTestCases(APITestCase):
 
         self.auth_client.force_authenticate(self.user)
 
-        project = Project.objects.create(
-            title="Test Project",
-            description="abc",
-            start_date="2021-09-01",
-            end_date="2024-09-30",
-        )
-        project.save()
+        # Timeline events are written when the transaction commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(
+                title="Test Project",
+                description="abc",
+                start_date="2021-09-01",
+                end_date="2024-09-30",
+            )
+            project.save()
 
     def test_get_timelines_api(self):
         response = self.auth_client.get("/api/timeline/1/")
@@ -600,7 +835,8 @@ class TimelineTestCases(APITestCase):
             "assignee": 2,
         }
 
-        response = self.auth_client.post("/api/tasks/", data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.auth_client.post("/api/tasks/", data)
         self.assertEqual(response.status_code, 201)
 
         response = self.auth_client.get("/api/timeline/1/")
@@ -608,7 +844,7 @@ class TimelineTestCases(APITestCase):
         self.assertEqual(len(response_data["timelines"]), 2)
 
 
-class NotificationTestCases(APITestCase):
+class NotificationTestCases(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.auth_client = APIClient()
         self.un_auth_client = APIClient()
@@ -712,8 +948,86 @@ class NotificationTestCases(APITestCase):
         response_data = response.json()
         self.assertEqual(response_data["message"], "No notification found")
 
+    def create_notifications(self, count):
+        return Notification.objects.bulk_create(
+            Notification(text=f"Notification {i}", user=self.user) for i in range(count)
+        )
+
+    def test_bulk_mark_read_api(self):
+        self.create_notifications(3)
+        other = Notification.objects.create(text="Other", user_id=2)
+
+        # One UPDATE of the notifications and one of the unread counter,
+        # wrapped in a savepoint.
+        with self.assertNumQueries(4):
+            response = self.auth_client.post("/api/notifications/mark_read/")
+        self.assertEqual(response.json()["updated"], 3)
+        self.assertFalse(
+            Notification.objects.filter(user=self.user, mark_read=False).exists()
+        )
+        other.refresh_from_db()
+        self.assertFalse(other.mark_read)
+
+    def test_bulk_mark_read_by_ids_and_time_api(self):
+        first, second, third = self.create_notifications(3)
+        Notification.objects.filter(id=first.id).update(
+            created_at="2020-01-01T00:00:00Z"
+        )
+
+        response = self.auth_client.post(
+            "/api/notifications/mark_read/",
+            {"ids": [first.id, second.id], "before": "2021-01-01T00:00:00Z"},
+            format="json",
+        )
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertEqual(
+            list(
+                Notification.objects.filter(mark_read=False)
+                .order_by("id")
+                .values_list("id", flat=True)
+            ),
+            [second.id, third.id],
+        )
+
+        response = self.auth_client.post(
+            "/api/notifications/mark_read/", {"ids": []}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.auth_client.post(
+            "/api/notifications/mark_read/", {"ids": ["x"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["error"], "ids: 0: A valid integer is required."
+        )
+
+    def test_bulk_mark_read_before_excludes_the_boundary(self):
+        older, at_boundary = self.create_notifications(2)
+        Notification.objects.filter(id=older.id).update(
+            created_at="2020-12-31T23:59:59Z"
+        )
+        Notification.objects.filter(id=at_boundary.id).update(
+            created_at="2021-01-01T00:00:00Z"
+        )
+
+        response = self.auth_client.post(
+            "/api/notifications/mark_read/",
+            {"before": "2021-01-01T00:00:00Z"},
+            format="json",
+        )
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertEqual(
+            list(
+                Notification.objects.filter(mark_read=False).values_list(
+                    "id", flat=True
+                )
+            ),
+            [at_boundary.id],
+        )
+
 
-class GetUserDataTestCase(APITestCase):
+class GetUserDataTestCase(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.auth_client = APIClient()
         self.unauth_client = APIClient()
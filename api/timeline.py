@@ -0,0 +1,113 @@
+import contextvars
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from .tasks import run_side_effect, write_timeline_events
+
+_local = threading.local()
+# The innermost timeline_buffer() scope. A context variable rather than a
+# thread local, so an async request's scope reaches the threads its ORM
+# calls run in (sync_to_async copies the context).
+_scope = contextvars.ContextVar("timeline_buffer", default=None)
+
+
+class TimelineBuffer:
+    """Collects timeline events and writes them with a single INSERT."""
+
+    def __init__(self):
+        self.events = []
+        self.flushed = False
+
+    def add(self, project_id, event_type):
+        self.events.append((project_id, event_type))
+
+    def flush(self):
+        self.flushed = True
+        events, self.events = self.events, []
+        if events:
+            run_side_effect(write_timeline_events, events)
+
+
+def _transaction_buffer(connection):
+    """
+    Return the buffer for the current transaction (or savepoint), creating it
+    and registering its on_commit flush on first use. Buffers whose flush was
+    discarded by a rollback are dropped so their events are never written.
+    """
+    if not hasattr(_local, "transactions"):
+        _local.transactions = {}
+    registered = [func for _, func, _ in connection.run_on_commit]
+    for key, buffer in list(_local.transactions.items()):
+        if buffer.flushed or buffer.flush not in registered:
+            del _local.transactions[key]
+
+    # Atomic blocks opened with savepoint=False push None and share the
+    # enclosing block's fate, so they share its buffer too.
+    key = tuple(sid for sid in connection.savepoint_ids if sid is not None)
+    buffer = _local.transactions.get(key)
+    if buffer is None:
+        buffer = _local.transactions[key] = TimelineBuffer()
+        transaction.on_commit(buffer.flush)
+    return buffer
+
+
+def record_timeline_event(project_id, event_type="created"):
+    """
+    Record a timeline event for the project with ``project_id``.
+
+    Inside an atomic block the event is buffered per transaction/savepoint,
+    inserted once it commits and dropped if it rolls back; otherwise, inside
+    a ``timeline_buffer()`` scope, it is inserted when the scope exits, and
+    anywhere else immediately. Setting
+    ``TIMELINE_BUFFERED_WRITES = False`` always inserts immediately.
+    """
+    if not getattr(settings, "TIMELINE_BUFFERED_WRITES", True):
+        run_side_effect(write_timeline_events, [(project_id, event_type)])
+        return
+
+    # Checked first: events of a transaction must share its fate, even
+    # inside a timeline_buffer() scope.
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        _transaction_buffer(connection).add(project_id, event_type)
+        return
+
+    scope = _scope.get()
+    if scope is not None:
+        scope.add(project_id, event_type)
+        return
+
+    run_side_effect(write_timeline_events, [(project_id, event_type)])
+
+
+@contextmanager
+def timeline_buffer():
+    """
+    Buffer every timeline event recorded in the block and flush them with one
+    ``bulk_create`` when the block exits, deferred until commit if a
+    transaction is still open.
+    """
+    buffer = TimelineBuffer()
+    token = _scope.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _scope.reset(token)
+        transaction.on_commit(buffer.flush)
+
+
+@asynccontextmanager
+async def atimeline_buffer():
+    """``timeline_buffer()`` for async code; the flush runs in a thread."""
+    buffer = TimelineBuffer()
+    token = _scope.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _scope.reset(token)
+        if buffer.events:
+            await sync_to_async(transaction.on_commit)(buffer.flush)
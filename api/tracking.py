@@ -0,0 +1,63 @@
+class TrackedFieldsMixin:
+    """
+    Remember the database values of ``tracked_fields`` when an instance is
+    loaded or saved, so changes can be detected without re-fetching the row.
+
+    Foreign keys are tracked by their ``*_id`` column, so no related object
+    is fetched either.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._store_loaded_values()
+        return instance
+
+    def _store_loaded_values(self, fields=None):
+        deferred = self.get_deferred_fields()
+        loaded = getattr(self, "_loaded_values", {})
+        for name in self.tracked_fields if fields is None else fields:
+            attname = self._meta.get_field(name).attname
+            if attname not in deferred:
+                loaded[name] = getattr(self, attname)
+        self._loaded_values = loaded
+
+    def get_loaded_value(self, field_name, default=None):
+        return getattr(self, "_loaded_values", {}).get(field_name, default)
+
+    def has_changed(self, field_name):
+        """
+        Return whether ``field_name`` differs from its stored value, or
+        ``None`` if the stored value is unknown (e.g. the instance was never
+        loaded from or saved to the database).
+        """
+        loaded = getattr(self, "_loaded_values", {})
+        if field_name not in loaded:
+            return None
+        attname = self._meta.get_field(field_name).attname
+        return loaded[field_name] != getattr(self, attname)
+
+    @property
+    def changed_fields(self):
+        return [name for name in self.tracked_fields if self.has_changed(name)]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._store_loaded_values(self._tracked_subset(kwargs.get("update_fields")))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._store_loaded_values(self._tracked_subset(fields))
+
+    def _tracked_subset(self, fields):
+        # ``fields`` may name fields or their attnames, e.g. "assignee_id".
+        if fields is None:
+            return None
+        fields = set(fields)
+        return [
+            name
+            for name in self.tracked_fields
+            if name in fields or self._meta.get_field(name).attname in fields
+        ]
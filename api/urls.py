@@ -1,47 +1,94 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework import routers
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from .async_views import (
+    AsyncCreateTimelineAPIView,
+    AsyncNotificationModelViewSet,
+    AsyncProjectModelViewSet,
+    AsyncTaskModelViewSet,
+    AsyncUserModelViewSet,
+)
 from .views import (
     CommentModelViewSet,
     CreateTimelineAPIView,
     DocumentModelViewSet,
     LogoutAPIView,
     NotificationModelViewSet,
+    NotificationStreamView,
     ProjectModelViewSet,
     SignupAPIView,
     TaskAssignModelViewSet,
+    TaskExportAPIView,
     TaskModelViewSet,
+    TimelineExportAPIView,
     UserModelViewSet,
 )
 
-router = routers.DefaultRouter()
-router.register(r"projects", ProjectModelViewSet, basename="projects")
-router.register(r"projects/<id>/", ProjectModelViewSet, basename="project_details")
-router.register(r"tasks", TaskModelViewSet, basename="tasks")
-router.register(r"tasks/<id>/", TaskModelViewSet, basename="task_details")
-router.register(r"documents", DocumentModelViewSet, basename="documents")
-router.register(r"documents/<id>/", DocumentModelViewSet, basename="document_details")
-router.register(r"comments", CommentModelViewSet, basename="comments")
-router.register(r"comments/<id>/", CommentModelViewSet, basename="comment_details")
-router.register(r"notifications", NotificationModelViewSet, basename="notifications")
 
-urlpatterns = [
-    path("login/", TokenObtainPairView.as_view(), name="login"),
-    path("user/", UserModelViewSet.as_view(), name="user_data"),
-    path("register/", view=SignupAPIView.as_view(), name="register"),
-    # path('login/', view=LoginAPIView.as_view(), name="login"),
-    path("logout/", view=LogoutAPIView.as_view(), name="logout"),
-    path(
-        "tasks/<id>/assign/",
-        view=TaskAssignModelViewSet.as_view({"post": "create"}),
-        name="task_assign",
-    ),
-    path("timeline/<id>/", view=CreateTimelineAPIView.as_view(), name="timeline"),
-    path(
-        "notifications/<id>/<str:mark_read>/",
-        view=NotificationModelViewSet.as_view({"put": "update"}),
-        name="mark_notifications",
-    ),
-    path("", include(router.urls)),
-]
+def build_urlpatterns(async_views=False):
+    """
+    The API's URL patterns; ``async_views`` swaps in the async read views of
+    ``api.async_views``.
+    """
+    if async_views:
+        project_viewset = AsyncProjectModelViewSet
+        task_viewset = AsyncTaskModelViewSet
+        notification_viewset = AsyncNotificationModelViewSet
+        timeline_view = AsyncCreateTimelineAPIView
+        user_view = AsyncUserModelViewSet
+    else:
+        project_viewset = ProjectModelViewSet
+        task_viewset = TaskModelViewSet
+        notification_viewset = NotificationModelViewSet
+        timeline_view = CreateTimelineAPIView
+        user_view = UserModelViewSet
+
+    router = routers.DefaultRouter()
+    router.register(r"projects", project_viewset, basename="projects")
+    router.register(r"projects/<id>/", project_viewset, basename="project_details")
+    router.register(r"tasks", task_viewset, basename="tasks")
+    router.register(r"tasks/<id>/", task_viewset, basename="task_details")
+    router.register(r"documents", DocumentModelViewSet, basename="documents")
+    router.register(
+        r"documents/<id>/", DocumentModelViewSet, basename="document_details"
+    )
+    router.register(r"comments", CommentModelViewSet, basename="comments")
+    router.register(r"comments/<id>/", CommentModelViewSet, basename="comment_details")
+    router.register(r"notifications", notification_viewset, basename="notifications")
+
+    return [
+        path("login/", TokenObtainPairView.as_view(), name="login"),
+        path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+        path("user/", user_view.as_view(), name="user_data"),
+        path("register/", view=SignupAPIView.as_view(), name="register"),
+        # path('login/', view=LoginAPIView.as_view(), name="login"),
+        path("logout/", view=LogoutAPIView.as_view(), name="logout"),
+        path(
+            "tasks/<id>/assign/",
+            view=TaskAssignModelViewSet.as_view({"post": "create"}),
+            name="task_assign",
+        ),
+        path("timeline/<id>/", view=timeline_view.as_view(), name="timeline"),
+        path(
+            "timeline/<id>/export/",
+            view=TimelineExportAPIView.as_view(),
+            name="timeline_export",
+        ),
+        path("tasks/export/", view=TaskExportAPIView.as_view(), name="task_export"),
+        path(
+            "notifications/stream/",
+            view=NotificationStreamView.as_view(),
+            name="notification_stream",
+        ),
+        path(
+            "notifications/<id>/<str:mark_read>/",
+            view=NotificationModelViewSet.as_view({"put": "update"}),
+            name="mark_notifications",
+        ),
+        path("", include(router.urls)),
+    ]
+
+
+urlpatterns = build_urlpatterns(settings.ASYNC_VIEWS)
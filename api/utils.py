@@ -1,20 +1,43 @@
+from functools import lru_cache
+from io import BytesIO
+
 from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
 
 
 def format_error(errors):
-    main_error = None
+    """
+    The first message in serializer ``errors``, prefixed with the path to the
+    field it belongs to, e.g. ``"ids: 0: A valid integer is required."``.
+    """
+    if isinstance(errors, dict):
+        for field, messages in errors.items():
+            message = format_error(messages)
+            if message:
+                return f"{field}: {message}"
+        return None
+    if isinstance(errors, list):
+        for index, messages in enumerate(errors):
+            message = format_error(messages)
+            if message:
+                # Nested serializers with ``many=True`` report one dict per item.
+                return f"{index}: {message}" if isinstance(messages, dict) else message
+        return None
+    return str(errors) if errors else None
+
 
-    for field, messages in errors.items():
-        if messages:
-            main_error = field + ": " + messages[0]
-            break
-    return main_error
+@lru_cache(maxsize=None)
+def _image_content():
+    buffer = BytesIO()
+    Image.new("RGB", (32, 32), "white").save(buffer, format="JPEG")
+    return buffer.getvalue()
 
 
 def generate_image():
+    # Built once per process; each call still gets a fresh file to upload.
     image = SimpleUploadedFile(
         name="test_image.jpg",
-        content=open("media/profile_pics/269376.jpg", "rb").read(),
+        content=_image_content(),
         content_type="image/jpeg",
     )
     return image
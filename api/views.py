@@ -1,21 +1,56 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model, login
-from rest_framework import permissions, status
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import exceptions, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework_simplejwt.tokens import RefreshToken, TokenError
 
+from .counters import adjust_unread_counts
+from .exports import EXPORT_FORMATS, export_response
 from .models import Comment, Document, Notification, Project, Task, Timeline
+from .pagination import (
+    KeysetPagination,
+    NotificationKeysetPagination,
+    TimelineKeysetPagination,
+)
 from .permissions import IsManager
+from .pubsub import get_broker
+from .response_cache import (
+    NOTIFICATIONS,
+    PROJECT,
+    PROJECTS,
+    TASK,
+    TASKS,
+    TIMELINE,
+    bump_versions,
+    cache_response,
+    url_object_scope,
+    user_scope,
+)
 from .serializers import (
     CommentSerializer,
     DocumentSerializer,
     LogoutSerializer,
-    NotificationSerializer,
+    NotificationMarkReadSerializer,
     ProjectSerializer,
+    TaskBulkCreateSerializer,
+    TaskBulkUpdateSerializer,
     TaskSerializer,
     TimelineSerializer,
     UserSerializer,
+    comment_values_serializer,
+    notification_values_serializer,
+    task_values_serializer,
+    timeline_values_serializer,
 )
 from .utils import format_error
 
@@ -24,6 +59,11 @@ from .utils import format_error
 
 User = get_user_model()
 
+BULK_MAX_TASKS = 500
+
+# Milliseconds a disconnected EventSource waits before reconnecting.
+STREAM_RETRY_MS = 5000
+
 
 # Create your views here.
 class SignupAPIView(APIView):
@@ -124,6 +164,7 @@ class LogoutAPIView(APIView):
 class ProjectModelViewSet(ModelViewSet):
     serializer_class = ProjectSerializer
     queryset = Project.objects.all()
+    pagination_class = KeysetPagination
 
     def get_permissions(self):
         if self.action in ["create", "update", "destroy"]:
@@ -158,17 +199,21 @@ class ProjectModelViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    @cache_response(user_scope(PROJECTS))
     def list(self, request, *args, **kwargs):
         try:
-            projects = Project.objects.all()
-            filtered_projects = []
-            for project in projects:
-                if request.user in project.team_members.all():
-                    filtered_projects.append(project)
-            serializer = self.serializer_class(filtered_projects, many=True)
+            # Scope to the user's memberships in SQL and fetch every project's
+            # member IDs in a single extra query for the serializer.
+            projects = Project.objects.filter(
+                team_members__id=request.user.id
+            ).prefetch_related(
+                Prefetch("team_members", queryset=User.objects.only("id"))
+            )
+            page = self.paginate_queryset(projects)
+            serializer = self.serializer_class(page, many=True)
             if serializer.data != []:
                 return Response(
-                    {"status_code": 200, "projects": serializer.data},
+                    self.paginator.get_paginated_envelope("projects", serializer.data),
                     status=status.HTTP_200_OK,
                 )
             return Response(
@@ -181,6 +226,7 @@ class ProjectModelViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    @cache_response(url_object_scope(PROJECT, "pk"))
     def retrieve(self, request, *args, **kwargs):
         try:
             project = self.get_object()
@@ -253,9 +299,16 @@ class ProjectModelViewSet(ModelViewSet):
 class TaskModelViewSet(ModelViewSet):
     serializer_class = TaskSerializer
     queryset = Task.objects.all()
+    pagination_class = KeysetPagination
 
     def get_permissions(self):
-        if self.action in ["create", "update", "destroy"]:
+        if self.action in [
+            "create",
+            "update",
+            "destroy",
+            "bulk_create",
+            "bulk_update",
+        ]:
             self.permission_classes = [IsManager]
         else:
             self.permission_classes = [permissions.IsAuthenticated]
@@ -286,14 +339,16 @@ class TaskModelViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    @cache_response(user_scope(TASKS))
     def list(self, request, *args, **kwargs):
         try:
-            user = request.user
-            tasks = Task.objects.filter(assignee=user)
-            serializer = self.serializer_class(tasks, many=True)
-            if serializer.data != []:
+            tasks = Task.objects.filter(assignee_id=request.user.id)
+            page = self.paginate_queryset(task_values_serializer.values(tasks))
+            if page:
                 return Response(
-                    {"status_code": 200, "tasks": serializer.data},
+                    self.paginator.get_paginated_envelope(
+                        "tasks", task_values_serializer.serialize(page)
+                    ),
                     status=status.HTTP_200_OK,
                 )
             return Response(
@@ -306,6 +361,7 @@ class TaskModelViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    @cache_response(url_object_scope(TASK, "pk"))
     def retrieve(self, request, *args, **kwargs):
         try:
             task = self.get_object()
@@ -373,6 +429,70 @@ class TaskModelViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request, *args, **kwargs):
+        try:
+            serializer = TaskBulkCreateSerializer(
+                data=request.data,
+                many=True,
+                allow_empty=False,
+                max_length=BULK_MAX_TASKS,
+            )
+            if serializer.is_valid():
+                tasks = serializer.save()
+                return Response(
+                    {
+                        "status_code": 201,
+                        "message": "Tasks created successfully",
+                        "tasks": TaskSerializer(tasks, many=True).data,
+                    },
+                    status=status.HTTP_201_CREATED,
+                )
+            return Response(
+                {"error": format_error(serializer.errors), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request, *args, **kwargs):
+        try:
+            serializer = TaskBulkUpdateSerializer(
+                Task.objects.all(),
+                data=request.data,
+                many=True,
+                allow_empty=False,
+                max_length=BULK_MAX_TASKS,
+            )
+            if serializer.is_valid():
+                tasks = serializer.save()
+                return Response(
+                    {
+                        "status_code": 200,
+                        "message": "Tasks updated successfully",
+                        "tasks": TaskSerializer(tasks, many=True).data,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+            return Response(
+                {"error": format_error(serializer.errors), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except exceptions.ValidationError as e:
+            return Response(
+                {"error": format_error(e.detail), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
 
 class TaskAssignModelViewSet(ModelViewSet):
     permission_classes = [IsManager]
@@ -418,6 +538,7 @@ class DocumentModelViewSet(ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = DocumentSerializer
     queryset = Document.objects.all()
+    pagination_class = KeysetPagination
 
     def create(self, request, *args, **kwargs):
         try:
@@ -446,10 +567,11 @@ class DocumentModelViewSet(ModelViewSet):
     def list(self, request, *args, **kwargs):
         try:
             documents = Document.objects.all()
-            serializer = self.serializer_class(documents, many=True)
+            page = self.paginate_queryset(documents)
+            serializer = self.serializer_class(page, many=True)
             if serializer.data != []:
                 return Response(
-                    {"status_code": 200, "documents": serializer.data},
+                    self.paginator.get_paginated_envelope("documents", serializer.data),
                     status=status.HTTP_200_OK,
                 )
             return Response(
@@ -534,6 +656,7 @@ class CommentModelViewSet(ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = CommentSerializer
     queryset = Comment.objects.all()
+    pagination_class = KeysetPagination
 
     def create(self, request, *args, **kwargs):
         try:
@@ -562,10 +685,12 @@ class CommentModelViewSet(ModelViewSet):
     def list(self, request, *args, **kwargs):
         try:
             comments = Comment.objects.all()
-            serializer = self.serializer_class(comments, many=True)
-            if serializer.data != []:
+            page = self.paginate_queryset(comment_values_serializer.values(comments))
+            if page:
                 return Response(
-                    {"status_code": 200, "comments": serializer.data},
+                    self.paginator.get_paginated_envelope(
+                        "comments", comment_values_serializer.serialize(page)
+                    ),
                     status=status.HTTP_200_OK,
                 )
             return Response(
@@ -668,14 +793,21 @@ class CommentModelViewSet(ModelViewSet):
 class CreateTimelineAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = TimelineSerializer
+    pagination_class = TimelineKeysetPagination
 
+    @cache_response(url_object_scope(TIMELINE, "id"))
     def get(self, request, *args, **kwargs):
         try:
             timelines = Timeline.objects.filter(project__id=kwargs["id"])
-            if timelines:
-                serializer = self.serializer_class(timelines, many=True)
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(
+                timeline_values_serializer.values(timelines), request, view=self
+            )
+            if page:
                 return Response(
-                    {"status_code": 200, "timelines": serializer.data},
+                    paginator.get_paginated_envelope(
+                        "timelines", timeline_values_serializer.serialize(page)
+                    ),
                     status=status.HTTP_200_OK,
                 )
             return Response(
@@ -689,20 +821,70 @@ class CreateTimelineAPIView(APIView):
             )
 
 
+class ExportAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def export(self, request, values_serializer, queryset, filename):
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {
+                    "error": "export_format must be one of: "
+                    + ", ".join(EXPORT_FORMATS),
+                    "status_code": 400,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return export_response(
+            values_serializer,
+            queryset,
+            export_format,
+            filename,
+            asynchronous=isinstance(request._request, ASGIRequest),
+        )
+
+
+class TimelineExportAPIView(ExportAPIView):
+    def get(self, request, *args, **kwargs):
+        try:
+            project = Project.objects.only("id").get(id=kwargs["id"])
+        except (Project.DoesNotExist, ValueError):
+            return Response(
+                {"status_code": 404, "message": "No project found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        timelines = Timeline.objects.filter(project=project).order_by("time", "id")
+        return self.export(
+            request, timeline_values_serializer, timelines, f"timeline-{project.id}"
+        )
+
+
+class TaskExportAPIView(ExportAPIView):
+    def get(self, request, *args, **kwargs):
+        tasks = Task.objects.filter(assignee_id=request.user.id).order_by("id")
+        return self.export(request, task_values_serializer, tasks, "tasks")
+
+
 class NotificationModelViewSet(ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     queryset = Notification.objects.all()
     lookup_field = "id"
+    pagination_class = NotificationKeysetPagination
 
+    @cache_response(user_scope(NOTIFICATIONS))
     def list(self, request, *args, **kwargs):
         try:
             notifications = Notification.objects.filter(
                 user__id=request.user.id, mark_read=False
             )
-            if notifications:
-                seriazlier = NotificationSerializer(notifications, many=True)
+            page = self.paginate_queryset(
+                notification_values_serializer.values(notifications)
+            )
+            if page:
                 return Response(
-                    {"status_code": 200, "notifications": seriazlier.data},
+                    self.paginator.get_paginated_envelope(
+                        "notifications", notification_values_serializer.serialize(page)
+                    ),
                     status=status.HTTP_200_OK,
                 )
 
@@ -720,16 +902,22 @@ class NotificationModelViewSet(ModelViewSet):
         try:
             notification = self.get_object()
             mark_read = kwargs["mark_read"].lower()
-            if mark_read == "true":
-                notification.mark_read = True
-            elif mark_read == "false":
-                notification.mark_read = False
-            else:
+            if mark_read not in ("true", "false"):
                 return Response(
                     {"error": "Invalid mark read value", "status_code": 400},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            notification.save()
+            mark_read = mark_read == "true"
+            # Conditional, so of two concurrent requests flipping the same
+            # row only the one that changed it moves the counter.
+            with transaction.atomic():
+                updated = Notification.objects.filter(
+                    pk=notification.pk, mark_read=not mark_read
+                ).update(mark_read=mark_read)
+                if updated:
+                    adjust_unread_counts({notification.user_id: -1 if mark_read else 1})
+            if updated:
+                bump_versions(NOTIFICATIONS, [notification.user_id])
             return Response(
                 {"status_code": 200, "message": "Notification marked as read"},
                 status=status.HTTP_200_OK,
@@ -745,6 +933,110 @@ class NotificationModelViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    @action(detail=False, methods=["post"], url_path="mark_read")
+    def mark_all_read(self, request, *args, **kwargs):
+        try:
+            serializer = NotificationMarkReadSerializer(
+                data=request.data, context={"request": request}
+            )
+            if serializer.is_valid():
+                updated = serializer.save()
+                return Response(
+                    {
+                        "status_code": 200,
+                        "message": "Notifications marked as read",
+                        "updated": updated,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+            return Response(
+                {"error": format_error(serializer.errors), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    @action(detail=False, methods=["get"], url_path="unread_count")
+    def unread_count(self, request, *args, **kwargs):
+        try:
+            count = (
+                User.objects.filter(id=request.user.id)
+                .values_list("unread_notification_count", flat=True)
+                .first()
+            )
+            return Response(
+                {"status_code": 200, "unread_count": count or 0},
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "status_code": 400},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class NotificationStreamView(View):
+    """
+    Server-Sent Events stream of the authenticated user's new notifications.
+
+    Async, so an ASGI server holds many idle streams without a thread each;
+    under WSGI every stream would hold a worker until it timed out, so it is
+    refused with 501. EventSource can't send headers, so the access token may
+    also be passed as ``?token=``. Clients load earlier notifications from
+    ``notifications/``.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {
+                    "error": "The notification stream needs an ASGI server "
+                    "(manage.py serve --mode asgi)",
+                    "status_code": 501,
+                },
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        try:
+            user = await sync_to_async(self.authenticate)(request)
+        except exceptions.AuthenticationFailed:
+            user = None
+        if user is None:
+            return JsonResponse(
+                {"error": "Invalid or missing access token", "status_code": 401},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        response = StreamingHttpResponse(
+            self.events(user.id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    @staticmethod
+    def authenticate(request):
+        authenticator = api_settings.DEFAULT_AUTHENTICATION_CLASSES[0]()
+        header = authenticator.get_header(request)
+        if header is not None:
+            raw_token = authenticator.get_raw_token(header)
+        else:
+            raw_token = request.GET.get("token", "").encode() or None
+        if raw_token is None:
+            return None
+        return authenticator.get_user(authenticator.get_validated_token(raw_token))
+
+    async def events(self, user_id):
+        keepalive = settings.NOTIFICATION_STREAM_KEEPALIVE
+        async with get_broker().subscribe(user_id) as subscription:
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            while True:
+                event = await subscription.get(keepalive)
+                # Comment lines keep proxies from closing an idle connection.
+                yield event if event is not None else ": keepalive\n\n"
+
 
 class UserModelViewSet(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -2,6 +2,9 @@
 ASGI config for api_task project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server for the live notification stream
+(``notifications/stream/``), which holds a connection open per client.
+Static files are served as under ``api_task.wsgi``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -9,8 +12,13 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_task.settings")
+os.environ.setdefault("ASYNC_VIEWS", "1")
 
 application = get_asgi_application()
+if settings.SERVE_FILES:
+    application = ASGIStaticFilesHandler(application)
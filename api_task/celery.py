@@ -0,0 +1,16 @@
+"""
+Celery app for the api_task project.
+
+Side-effect jobs (timeline events, notifications) are declared in
+``api/tasks.py`` and only queued here when ``ASYNC_SIDE_EFFECTS`` is on.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_task.settings")
+
+app = Celery("api_task")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
@@ -25,7 +25,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = "django-insecure-06*+*^=%z_cbcbsr&a&=g3rexf-g7=0t!vgmuw7=i1-8qlix1("
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# `manage.py serve` runs with DEBUG=0 unless told otherwise.
+DEBUG = os.environ.get("DEBUG", "1") == "1"
 
 ALLOWED_HOSTS = ["*"]
 
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -53,6 +55,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.TimelineBufferMiddleware",
 ]
 
 ROOT_URLCONF = "api_task.urls"
@@ -89,24 +92,127 @@ WSGI_APPLICATION = "api_task.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
-        "NAME": "mypostgresdatabase",
+        "NAME": os.environ.get("DB_NAME", "mypostgresdatabase"),
         "USER": "myuser",
         "PASSWORD": "12345",
-        "HOST": "localhost",
-        "PORT": "5432",
+        "HOST": os.environ.get("DB_HOST", "localhost"),
+        "PORT": os.environ.get("DB_PORT", "5432"),
+        # Seconds a connection is reused across requests; 0 opens one per
+        # request. `manage.py serve` turns this on for WSGI workers.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "0")),
+        # Check reused connections before each request instead of failing it.
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Set DB_POOLER=pgbouncer when HOST/PORT point at PgBouncer in transaction
+# pooling mode: server-side cursors (used by exports) don't survive there.
+if os.environ.get("DB_POOLER") == "pgbouncer":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Stateless mode trusts the token's user ID claim instead of loading
+        # the user on every request; see api.authentication.
+        (
+            "api.authentication.StatelessJWTAuthentication"
+            if os.environ.get("JWT_STATELESS_AUTH", "0") == "1"
+            else "rest_framework_simplejwt.authentication.JWTAuthentication"
+        ),
     ],
     "EXCEPTION_HANDLER": "drf_standardized_errors.handler.exception_handler",
+    # orjson-backed JSON when installed; same values as DRF's JSON classes.
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# Shared cache for role lookups and cached responses; point REDIS_URL at Redis so every worker sees
+# the same entries and invalidations. Falls back to a per-process cache.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Seconds a user's role stays cached for api.permissions.IsManager. Profile
+# changes invalidate it, but without REDIS_URL only in the worker that made
+# them, so other workers' copies are kept short-lived.
+ROLE_CACHE_TIMEOUT = 60 * 60 if os.environ.get("REDIS_URL") else 60
+
+# Seconds list responses stay in the per-user response cache (api.response_cache);
+# signals invalidate them as soon as the underlying rows change. 0 disables it.
+# Off by default without REDIS_URL: a worker's per-process cache never hears of
+# invalidations made in other workers and would serve stale responses.
+RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get(
+        "RESPONSE_CACHE_TIMEOUT", "300" if os.environ.get("REDIS_URL") else "0"
+    )
+)
+
+# Serve the hot read endpoints with the async views of api.async_views. On by
+# default under api_task.asgi, off under WSGI where every async view would
+# need an event loop of its own.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "0") == "1"
+
+# Broker behind the live notification stream (api.pubsub). The in-process
+# broker only reaches clients of the process that created the notification,
+# so use Redis when running several server processes or Celery workers.
+NOTIFICATION_BROKER = (
+    "api.pubsub.RedisBroker"
+    if os.environ.get("REDIS_URL")
+    else "api.pubsub.InProcessBroker"
+)
+NOTIFICATION_BROKER_URL = os.environ.get("REDIS_URL")
+# Seconds between keepalive comments on an idle stream.
+NOTIFICATION_STREAM_KEEPALIVE = 15
+
+# Per-request query count and DB/serializer/render timings, sent as a
+# Server-Timing header and aggregated per route for `manage.py request_metrics`
+# (api.instrumentation). Workers write their histograms to the cache every
+# REQUEST_METRICS_FLUSH_INTERVAL seconds, so the command needs a shared cache.
+# Off by default: the header tells every client how the server spends its time.
+REQUEST_METRICS = os.environ.get("REQUEST_METRICS", "0") == "1"
+REQUEST_METRICS_FLUSH_INTERVAL = 10
+
+# Batch timeline inserts per request/transaction; set to False to insert each
+# event as soon as it happens.
+TIMELINE_BUFFERED_WRITES = True
+
+# Run side effects (timeline events, notifications) on Celery workers instead
+# of inside the request. Off by default; without CELERY_BROKER_URL the broker
+# is an in-memory transport with eager execution so tests and local runs need
+# no worker, while a configured broker gets its jobs queued.
+ASYNC_SIDE_EFFECTS = os.environ.get("ASYNC_SIDE_EFFECTS", "0") == "1"
+
+CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "memory://")
+CELERY_TASK_ALWAYS_EAGER = (
+    os.environ.get(
+        "CELERY_TASK_ALWAYS_EAGER",
+        "0" if "CELERY_BROKER_URL" in os.environ else "1",
+    )
+    == "1"
+)
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_IGNORE_RESULT = True
+
 DRF_STANDARDIZED_ERRORS = {
     "EXCEPTION_FORMATTER_CLASS": "api.exceptions.MyExceptionFormatter"
 }
@@ -123,8 +229,14 @@ SIMPLE_JWT = {
     "TOKEN_BLACKLIST": True,
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_REFRESH_SERIALIZER": "api.serializers.CachedTokenRefreshSerializer",
 }
 
+# In-process cache of token blacklist lookups (api.blacklist). Misses are not
+# cached unless TOKEN_BLACKLIST_NEGATIVE_CACHE_TTL is above zero.
+TOKEN_BLACKLIST_CACHE_SIZE = 10000
+TOKEN_BLACKLIST_NEGATIVE_CACHE_TTL = 0
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -161,9 +273,17 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.0/howto/static-files/
 
 STATIC_URL = "static/"
+# Filled by `manage.py collectstatic`, for the web server in front to serve.
+STATIC_ROOT = os.environ.get("STATIC_ROOT", os.path.join(BASE_DIR, "staticfiles"))
 
 MEDIA_URL = "/media/"
-MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+MEDIA_ROOT = os.environ.get("MEDIA_ROOT", os.path.join(BASE_DIR, "media"))
+
+# Let the app serve static files and uploads itself, for when no web server
+# fronts it (the Docker image turns this on). Django's handlers do no caching
+# or compression, so wherever a web server can serve STATIC_ROOT and
+# MEDIA_ROOT, leave it off. DEBUG serves uploads either way.
+SERVE_FILES = os.environ.get("SERVE_FILES", "0") == "1"
 
 
 # Default primary key field type
@@ -0,0 +1,29 @@
+"""
+Settings for ``manage.py test``, which uses them unless DJANGO_SETTINGS_MODULE
+says otherwise. Uploads stay in memory, passwords use a fast hasher and every
+backend is local to the process, so the suite leaves nothing in ``media/``
+and runs with ``manage.py test --parallel``. The database is left as
+configured in ``settings``: PostgreSQL, or whatever DB_* points at.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# Insecure, but hashing with PBKDF2 dominated tests that create users.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Never share state with other test processes, whatever the environment says.
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Off by default (the response cache only without Redis); on so the tests
+# cover them.
+RESPONSE_CACHE_TIMEOUT = 300
+REQUEST_METRICS = True
+NOTIFICATION_BROKER = "api.pubsub.InProcessBroker"
+NOTIFICATION_BROKER_URL = None
+ASYNC_SIDE_EFFECTS = False
+CELERY_BROKER_URL = "memory://"
+CELERY_TASK_ALWAYS_EAGER = True
@@ -2,6 +2,8 @@
 WSGI config for api_task project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+With ``SERVE_FILES`` on it serves static files too; otherwise the web server
+in front serves ``STATIC_ROOT``, filled by ``manage.py collectstatic``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/wsgi/
@@ -9,8 +11,12 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import StaticFilesHandler
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_task.settings")
 
 application = get_wsgi_application()
+if settings.SERVE_FILES:
+    application = StaticFilesHandler(application)
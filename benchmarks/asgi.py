@@ -0,0 +1,161 @@
+"""
+Compare throughput and tail latency of the read endpoints served by the async
+views through the ASGI handler with the sync views through the WSGI handler.
+
+Seeds a throwaway test database and drives both Django applications in
+process, the way uvicorn and a threaded WSGI server would: ASGI requests run
+as concurrent tasks on one event loop, WSGI requests on a pool of threads::
+
+    python -m benchmarks.asgi --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from .common import latency_report, run_wsgi, seed_dataset, setup_django, test_database
+
+ENDPOINTS = (
+    "/api/projects/",
+    "/api/tasks/",
+    "/api/notifications/",
+    "/api/timeline/1/",
+    "/api/user/",
+)
+
+
+def run_asgi(application, path, token, requests, concurrency):
+    url = urlsplit(path)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": [
+            (b"host", b"testserver"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+
+    async def request():
+        received = False
+        status_code = None
+
+        async def receive():
+            nonlocal received
+            if received:
+                # Block like a real server until the app gives up on the body.
+                await asyncio.Event().wait()
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        start = time.perf_counter()
+        await application(dict(scope), receive, send)
+        assert status_code in (200, 404), status_code
+        return (time.perf_counter() - start) * 1000
+
+    async def worker(count, samples):
+        for _ in range(count):
+            samples.append(await request())
+
+    async def main():
+        await request()  # warm up
+        samples = []
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker(requests // concurrency, samples) for _ in range(concurrency))
+        )
+        return samples, time.perf_counter() - start
+
+    return latency_report(*asyncio.run(main()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="Dataset multiplier.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--response-cache",
+        action="store_true",
+        help="Keep the response cache on; by default every request hits the database.",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from django.test import override_settings
+    from django.urls import include, path
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from api.models import Project, UserModel
+    from api.urls import build_urlpatterns
+
+    class SyncURLConf:
+        urlpatterns = [path("api/", include(build_urlpatterns(async_views=False)))]
+
+    class AsyncURLConf:
+        urlpatterns = [path("api/", include(build_urlpatterns(async_views=True)))]
+
+    servers = {
+        "wsgi_sync_views": (run_wsgi, get_wsgi_application(), SyncURLConf),
+        "asgi_async_views": (run_asgi, get_asgi_application(), AsyncURLConf),
+    }
+
+    report = {}
+    with test_database():
+        seed_dataset(
+            users=200 * args.scale,
+            projects=100 * args.scale,
+            tasks=5000 * args.scale,
+            comments=10000 * args.scale,
+            timeline=20000 * args.scale,
+            notifications=20000 * args.scale,
+        )
+        user = UserModel.objects.order_by("id").first()
+        token = str(AccessToken.for_user(user))
+        project_id = (
+            Project.objects.filter(team_members=user)
+            .values_list("id", flat=True)
+            .first()
+        )
+
+        for endpoint in ENDPOINTS:
+            endpoint = endpoint.replace("/1/", f"/{project_id}/")
+            report[endpoint] = {}
+            for label, (run, application, urlconf) in servers.items():
+                overrides = {"ROOT_URLCONF": urlconf}
+                if not args.response_cache:
+                    overrides["RESPONSE_CACHE_TIMEOUT"] = 0
+                with override_settings(**overrides):
+                    report[endpoint][label] = run(
+                        application, endpoint, token, args.requests, args.concurrency
+                    )
+
+    for endpoint, results in report.items():
+        print(f"== {endpoint}")
+        for label, result in results.items():
+            print(f"-- {label}: {result}")
+        print()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare requests/sec of the read-heavy list endpoints with the default
+``JWTAuthentication`` and with ``StatelessJWTAuthentication``.
+
+Seeds a throwaway test database and replays authenticated GETs through the
+full request stack with Django's test client::
+
+    python -m benchmarks.auth --requests 500
+"""
+
+import argparse
+import json
+import time
+
+from .common import seed_dataset, setup_django, test_database
+
+ENDPOINTS = ("/api/tasks/", "/api/notifications/")
+
+
+def authentication_classes():
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+
+    from api.authentication import StatelessJWTAuthentication
+
+    return {
+        "jwt": JWTAuthentication,
+        "stateless_jwt": StatelessJWTAuthentication,
+    }
+
+
+def run_endpoint(client, path, requests):
+    from django.db import connection
+
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        response = client.get(path)
+    assert response.status_code in (200, 404), response.content
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_sec": round(requests / elapsed, 1),
+        "mean_ms": round(elapsed / requests * 1000, 3),
+        "queries_per_request": len(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="Dataset multiplier.")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args()
+
+    setup_django()
+    from unittest import mock
+
+    from rest_framework.test import APIClient
+    from rest_framework.views import APIView
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from api.models import UserModel
+
+    report = {}
+    with test_database():
+        seed_dataset(
+            users=200 * args.scale,
+            projects=100 * args.scale,
+            tasks=5000 * args.scale,
+            comments=10000 * args.scale,
+            timeline=20000 * args.scale,
+            notifications=20000 * args.scale,
+        )
+        user = UserModel.objects.order_by("id").first()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+        for path in ENDPOINTS:
+            report[path] = {}
+            for label, cls in authentication_classes().items():
+                with mock.patch.object(APIView, "authentication_classes", [cls]):
+                    report[path][label] = run_endpoint(client, path, args.requests)
+
+    for path, results in report.items():
+        print(f"== {path}")
+        for label, result in results.items():
+            print(f"-- {label}: {result}")
+        print()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
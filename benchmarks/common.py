@@ -0,0 +1,143 @@
+"""Helpers shared by the benchmark scripts in this package."""
+
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from urllib.parse import urlsplit
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_task.settings")
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """
+    Run the block against a throwaway ``test_*`` database, like the test
+    runner does, so benchmarks never touch real data.
+    """
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def measure(func, repeat=20):
+    """Call ``func`` ``repeat`` times and return timing stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "min": round(samples[0], 3),
+        "median": round(statistics.median(samples), 3),
+        "max": round(samples[-1], 3),
+    }
+
+
+def latency_report(samples, elapsed):
+    """Throughput and latency percentiles of per-request ``samples`` in ms."""
+    samples.sort()
+
+    def percentile(p):
+        return round(samples[min(len(samples) - 1, int(len(samples) * p))], 3)
+
+    return {
+        "requests_per_sec": round(len(samples) / elapsed, 1),
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def wsgi_request(application, method, path, headers=(), body=b""):
+    """
+    Send one request through the WSGI ``application`` and return its status
+    code and headers; ``headers`` are ``(name, value)`` pairs.
+    """
+    url = urlsplit(path)
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": url.path,
+        "QUERY_STRING": url.query,
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "testserver",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": BytesIO(),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in headers:
+        key = name.upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = "HTTP_" + key
+        environ[key] = value
+    started = []
+
+    def start_response(status, response_headers, exc_info=None):
+        started.append((int(status.split()[0]), dict(response_headers)))
+
+    response = application(environ, start_response)
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return started[0]
+
+
+def run_wsgi(application, path, token, requests, concurrency):
+    """
+    GET ``path`` ``requests`` times through the WSGI ``application`` from
+    ``concurrency`` threads, like a threaded WSGI server, and return
+    ``latency_report`` stats.
+    """
+    headers = [("Authorization", f"Bearer {token}")]
+
+    def request():
+        start = time.perf_counter()
+        status_code, _ = wsgi_request(application, "GET", path, headers)
+        assert status_code in (200, 404), status_code
+        return (time.perf_counter() - start) * 1000
+
+    def worker(count):
+        from django.db import connections
+
+        try:
+            return [request() for _ in range(count)]
+        finally:
+            # Persistent connections would outlive the thread otherwise.
+            connections.close_all()
+
+    request()  # warm up
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(worker, [requests // concurrency] * concurrency))
+        elapsed = time.perf_counter() - start
+    return latency_report([ms for samples in results for ms in samples], elapsed)
+
+
+def seed_dataset(**counts):
+    """Seed the test database with ``api.seeding.seed_dataset``."""
+    from api.seeding import seed_dataset
+
+    seed_dataset(**counts)
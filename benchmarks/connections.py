@@ -0,0 +1,89 @@
+"""
+Compare per-request latency through the WSGI handler with a new database
+connection per request (``CONN_MAX_AGE=0``) and with persistent connections,
+as ``manage.py serve`` configures them.
+
+Seeds a throwaway test database and replays authenticated GETs from a pool
+of threads, like threaded WSGI workers; point ``DB_HOST``/``DB_PORT`` at
+PgBouncer to measure a pooled setup the same way::
+
+    python -m benchmarks.connections --requests 1000 --concurrency 8
+"""
+
+import argparse
+import json
+import threading
+
+from .common import run_wsgi, seed_dataset, setup_django, test_database
+
+ENDPOINTS = ("/api/tasks/", "/api/user/")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--conn-max-age",
+        type=int,
+        default=60,
+        help="CONN_MAX_AGE of the persistent run.",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.wsgi import get_wsgi_application
+    from django.db.backends.signals import connection_created
+    from django.test import override_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from api.models import UserModel
+
+    application = get_wsgi_application()
+    opened = []
+    lock = threading.Lock()
+
+    def count_connection(sender, connection, **kwargs):
+        with lock:
+            opened.append(connection.alias)
+
+    connection_created.connect(count_connection)
+
+    report = {}
+    # Every request must reach the database, not the response cache.
+    with test_database() as connection, override_settings(RESPONSE_CACHE_TIMEOUT=0):
+        seed_dataset(users=200, projects=100, tasks=5000, notifications=5000)
+        token = str(AccessToken.for_user(UserModel.objects.order_by("id").first()))
+        connection.close()
+
+        for path in ENDPOINTS:
+            report[path] = {}
+            for label, max_age in (
+                ("per_request", 0),
+                ("persistent", args.conn_max_age),
+            ):
+                # Connections of every thread are built from this dict.
+                connection.settings_dict["CONN_MAX_AGE"] = max_age
+                opened.clear()
+                result = run_wsgi(
+                    application, path, token, args.requests, args.concurrency
+                )
+                # Includes the warm-up request.
+                result["connections_per_request"] = round(
+                    len(opened) / (args.requests + 1), 3
+                )
+                report[path][label] = result
+
+    for path, results in report.items():
+        print(f"== {path}")
+        for label, result in results.items():
+            print(f"-- {label}: {result}")
+        print()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compare query plans and timings of the list endpoints' queries with and
+without the indexes declared in ``api/models.py``.
+
+Seeds a throwaway test database, drops the model indexes, measures every
+list query, recreates the indexes and measures again::
+
+    python -m benchmarks.indexes --scale 10 --analyze
+"""
+
+import argparse
+import json
+
+from .common import measure, seed_dataset, setup_django, test_database
+
+
+def list_queries():
+    """The querysets behind each list endpoint, as built in ``api/views.py``."""
+    from django.db.models import Prefetch
+
+    from api.models import (
+        Comment,
+        Document,
+        Notification,
+        Project,
+        Task,
+        Timeline,
+        UserModel,
+    )
+
+    user_id = UserModel.objects.order_by("id").values_list("id", flat=True).first()
+    project_id = Project.objects.order_by("id").values_list("id", flat=True).first()
+    task_id = Task.objects.order_by("id").values_list("id", flat=True).first()
+    return {
+        "projects": Project.objects.filter(team_members__id=user_id)
+        .prefetch_related(
+            Prefetch("team_members", queryset=UserModel.objects.only("id"))
+        )
+        .order_by("-id")[:51],
+        "tasks": Task.objects.filter(assignee=user_id).order_by("-id")[:51],
+        "tasks_by_status": Task.objects.filter(assignee=user_id, status="open"),
+        "documents": Document.objects.order_by("-id")[:51],
+        "comments": Comment.objects.order_by("-id")[:51],
+        "comments_by_task": Comment.objects.filter(task=task_id).order_by("created_at"),
+        "comments_by_project": Comment.objects.filter(project=project_id).order_by(
+            "created_at"
+        ),
+        "timeline": Timeline.objects.filter(project__id=project_id).order_by(
+            "-time", "-id"
+        )[:51],
+        "notifications": Notification.objects.filter(
+            user__id=user_id, mark_read=False
+        ).order_by("-created_at", "-id")[:51],
+    }
+
+
+def model_indexes():
+    from django.apps import apps
+
+    for model in apps.get_app_config("api").get_models():
+        for index in model._meta.indexes:
+            yield model, index
+
+
+def run_queries(queries, repeat, analyze):
+    from django.db import connection
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+    results = {}
+    for name, queryset in queries.items():
+        explain_options = {"analyze": True} if analyze else {}
+        results[name] = {
+            "plan": queryset.explain(**explain_options),
+            "timing_ms": measure(lambda: list(queryset.all()), repeat=repeat),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="Dataset multiplier.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--analyze", action="store_true", help="Use EXPLAIN ANALYZE where supported."
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    with test_database():
+        seed_dataset(
+            users=200 * args.scale,
+            projects=100 * args.scale,
+            tasks=5000 * args.scale,
+            comments=10000 * args.scale,
+            timeline=20000 * args.scale,
+            notifications=20000 * args.scale,
+        )
+        indexes = list(model_indexes())
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.remove_index(model, index)
+        before = run_queries(list_queries(), args.repeat, args.analyze)
+
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+        after = run_queries(list_queries(), args.repeat, args.analyze)
+
+    report = {name: {"before": before[name], "after": after[name]} for name in before}
+    for name, result in report.items():
+        print(f"== {name}")
+        for label in ("before", "after"):
+            print(f"-- {label}: {result[label]['timing_ms']}")
+            print(result[label]["plan"])
+        print()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,516 @@
+"""
+Load-test every request/response endpoint of ``api/urls.py`` against a
+seeded dataset.
+
+Seeds a throwaway test database with Faker data, then sends each scenario's
+requests from a pool of threads, either in process through the WSGI handler
+or over HTTP to a local ``manage.py serve`` started on the test database
+(``--server wsgi|asgi``). Reports throughput, p50/p95/p99 latency, query
+counts (from the ``Server-Timing`` header) and status codes per endpoint as
+JSON with stable keys, so reports from two commits can be diffed::
+
+    python -m benchmarks.load --scale 2 --requests 400 --output before.json
+    python -m benchmarks.load --server asgi --only tasks- --output after.json
+
+The notification stream holds its connection open until the client leaves,
+so it has no latency to report and is left out. Deletes remove rows created
+for them just before each request, leaving the dataset as seeded.
+"""
+
+import argparse
+import datetime
+import http.client
+import itertools
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import latency_report, seed_dataset, setup_django, test_database
+
+STATUSES = ("open", "review", "working", "awaiting release", "waiting qa")
+BOUNDARY = "LoadTestBoundary"
+
+
+class Multipart(dict):
+    """A body sent as multipart/form-data instead of JSON."""
+
+    def encode(self):
+        from django.test.client import encode_multipart
+
+        return (
+            encode_multipart(BOUNDARY, self),
+            f"multipart/form-data; boundary={BOUNDARY}",
+        )
+
+
+def new_task(ids, rng):
+    return {
+        "title": f"Load test task {rng.randrange(10**6)}",
+        "description": "Created by benchmarks.load",
+        "status": rng.choice(STATUSES),
+        "project": rng.choice(ids["project"]),
+        "assignee": rng.choice(ids["user"]),
+    }
+
+
+def new_project(ids, rng):
+    today = datetime.date.today()
+    return {
+        "title": f"Load test project {rng.randrange(10**6)}",
+        "description": "Created by benchmarks.load",
+        # The end date has to be in the future.
+        "start_date": today.isoformat(),
+        "end_date": (today + datetime.timedelta(days=30)).isoformat(),
+        "team_members": ids["manager"],
+    }
+
+
+def new_document(ids, rng):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    return Multipart(
+        name="load-test.txt",
+        description="Created by benchmarks.load",
+        file=SimpleUploadedFile("load-test.txt", b"benchmarks.load"),
+        version=next(ids["versions"]),
+        project=rng.choice(ids["project"]),
+    )
+
+
+def refresh_token(ids, rng):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from api.models import UserModel
+
+    return {"refresh": str(RefreshToken.for_user(UserModel(pk=ids["manager"][0])))}
+
+
+# Rows created for a "{new_<kind>}" path, returning the new row's ID.
+def create_project(ids, rng):
+    from api.models import Project
+
+    today = datetime.date.today()
+    project = Project.objects.create(
+        title="Load test project",
+        description="Created by benchmarks.load",
+        start_date=today,
+        end_date=today + datetime.timedelta(days=30),
+    )
+    project.team_members.add(*ids["manager"])
+    return project.id
+
+
+def create_task(ids, rng):
+    from api.models import Task
+
+    return Task.objects.create(
+        title="Load test task",
+        description="Created by benchmarks.load",
+        status="open",
+        project_id=rng.choice(ids["project"]),
+        assignee_id=ids["manager"][0],
+    ).id
+
+
+def create_document(ids, rng):
+    from api.models import Document
+
+    return Document.objects.create(
+        name="load-test.txt",
+        description="Created by benchmarks.load",
+        file="document_files/load-test.txt",
+        version=next(ids["versions"]),
+        project_id=rng.choice(ids["project"]),
+    ).id
+
+
+def create_comment(ids, rng):
+    from api.models import Comment, Task
+
+    task = Task.objects.only("project_id").get(pk=rng.choice(ids["task"]))
+    return Comment.objects.create(
+        text="Load test comment",
+        author_id=ids["manager"][0],
+        task=task,
+        project_id=task.project_id,
+    ).id
+
+
+NEW_ROWS = {
+    "project": create_project,
+    "task": create_task,
+    "document": create_document,
+    "comment": create_comment,
+}
+
+
+# (name, method, path, body); "{kind}" in a path is replaced with a random
+# seeded ID and "{new_kind}" with the ID of a row created for the request.
+# A callable body is called with the IDs and an RNG.
+SCENARIOS = (
+    ("projects-list", "GET", "/api/projects/", None),
+    ("projects-detail", "GET", "/api/projects/{project}/", None),
+    ("tasks-list", "GET", "/api/tasks/", None),
+    ("tasks-detail", "GET", "/api/tasks/{task}/", None),
+    ("tasks-export", "GET", "/api/tasks/export/", None),
+    ("documents-list", "GET", "/api/documents/", None),
+    ("documents-detail", "GET", "/api/documents/{document}/", None),
+    ("comments-list", "GET", "/api/comments/", None),
+    ("comments-detail", "GET", "/api/comments/{comment}/", None),
+    ("notifications-list", "GET", "/api/notifications/", None),
+    ("notifications-unread-count", "GET", "/api/notifications/unread_count/", None),
+    ("timeline", "GET", "/api/timeline/{project}/", None),
+    ("timeline-export", "GET", "/api/timeline/{project}/export/", None),
+    ("user", "GET", "/api/user/", None),
+    (
+        "login",
+        "POST",
+        "/api/login/",
+        lambda ids, rng: {"email": "user0@example.com", "password": "password"},
+    ),
+    (
+        "register",
+        "POST",
+        "/api/register/",
+        lambda ids, rng: {
+            "username": "Load test user",
+            "email": f"load-{rng.randrange(10**12)}@example.com",
+            "password": "password",
+            "password2": "password",
+        },
+    ),
+    ("token-refresh", "POST", "/api/token/refresh/", refresh_token),
+    ("logout", "POST", "/api/logout/", refresh_token),
+    ("projects-create", "POST", "/api/projects/", new_project),
+    ("tasks-create", "POST", "/api/tasks/", new_task),
+    (
+        "tasks-bulk-create",
+        "POST",
+        "/api/tasks/bulk/",
+        lambda ids, rng: [new_task(ids, rng) for _ in range(20)],
+    ),
+    (
+        "tasks-update",
+        "PATCH",
+        "/api/tasks/{task}/",
+        lambda ids, rng: {"status": rng.choice(STATUSES)},
+    ),
+    (
+        "tasks-bulk-update",
+        "PATCH",
+        "/api/tasks/bulk/",
+        lambda ids, rng: [
+            {"id": task_id, "status": rng.choice(STATUSES)}
+            for task_id in rng.sample(ids["task"], 20)
+        ],
+    ),
+    (
+        "tasks-assign",
+        "POST",
+        "/api/tasks/{task}/assign/",
+        lambda ids, rng: {"assignee": rng.choice(ids["user"])},
+    ),
+    ("documents-create", "POST", "/api/documents/", new_document),
+    (
+        "comments-create",
+        "POST",
+        "/api/comments/",
+        lambda ids, rng: {
+            "text": "Load test comment",
+            "author": ids["user"][0],
+            "task": rng.choice(ids["task"]),
+            "project": rng.choice(ids["project"]),
+        },
+    ),
+    ("notifications-mark", "PUT", "/api/notifications/{notification}/true/", None),
+    ("notifications-mark-all", "POST", "/api/notifications/mark_read/", {}),
+    ("projects-delete", "DELETE", "/api/projects/{new_project}/", None),
+    ("tasks-delete", "DELETE", "/api/tasks/{new_task}/", None),
+    ("documents-delete", "DELETE", "/api/documents/{new_document}/", None),
+    ("comments-delete", "DELETE", "/api/comments/{new_comment}/", None),
+)
+
+QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def seeded_ids(manager):
+    from django.db.models import Max
+
+    from api.models import Comment, Document, Notification, Project, Task, UserModel
+
+    project_ids = list(
+        Project.objects.filter(team_members=manager).values_list("id", flat=True)
+    )
+    return {
+        "project": project_ids,
+        "task": list(
+            Task.objects.filter(project_id__in=project_ids).values_list("id", flat=True)
+        ),
+        "document": list(Document.objects.values_list("id", flat=True)[:1000]),
+        "comment": list(Comment.objects.values_list("id", flat=True)[:1000]),
+        "notification": list(
+            Notification.objects.filter(user=manager).values_list("id", flat=True)
+        ),
+        "user": list(UserModel.objects.values_list("id", flat=True)[:1000]),
+        "manager": [manager.id],
+        # Document versions are unique; next() on a count is thread-safe.
+        "versions": itertools.count(
+            (Document.objects.aggregate(last=Max("version"))["last"] or 0) + 1
+        ),
+    }
+
+
+def path_id(kind, ids, rng):
+    if kind.startswith("new_"):
+        return NEW_ROWS[kind[4:]](ids, rng)
+    return rng.choice(ids[kind])
+
+
+def build_request(scenario, ids, rng):
+    _, method, path, body = scenario
+    path = re.sub(r"{(\w+)}", lambda m: str(path_id(m.group(1), ids, rng)), path)
+    if callable(body):
+        body = body(ids, rng)
+    if isinstance(body, Multipart):
+        return method, path, *body.encode()
+    return (
+        method,
+        path,
+        b"" if body is None else json.dumps(body).encode(),
+        "application/json",
+    )
+
+
+def in_process_sender(token):
+    from django.core.wsgi import get_wsgi_application
+
+    from .common import wsgi_request
+
+    application = get_wsgi_application()
+
+    def send(method, path, body, content_type):
+        headers = [
+            ("Authorization", f"Bearer {token}"),
+            ("Content-Type", content_type),
+        ]
+        return wsgi_request(application, method, path, headers, body)
+
+    return send
+
+
+def http_sender(token, host, port):
+    local = threading.local()
+
+    def send(method, path, body, content_type):
+        headers = {"Authorization": f"Bearer {token}", "Content-Type": content_type}
+        # One keep-alive connection per thread, like a browser.
+        if getattr(local, "connection", None) is None:
+            local.connection = http.client.HTTPConnection(host, port, timeout=60)
+        try:
+            local.connection.request(method, path, body=body, headers=headers)
+            response = local.connection.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            local.connection.close()
+            local.connection = None
+            raise
+        return response.status, dict(response.getheaders())
+
+    return send
+
+
+def run_scenario(send, scenario, ids, requests, concurrency):
+    def worker(index):
+        from django.db import connections
+
+        rng = random.Random(f"{scenario[0]}:{index}")
+        results = []
+        try:
+            for _ in range(requests // concurrency):
+                request = build_request(scenario, ids, rng)
+                start = time.perf_counter()
+                status_code, headers = send(*request)
+                elapsed = (time.perf_counter() - start) * 1000
+                match = QUERIES.search(headers.get("Server-Timing", ""))
+                results.append(
+                    (elapsed, status_code, int(match.group(1)) if match else None)
+                )
+        finally:
+            connections.close_all()
+        return results
+
+    send(*build_request(scenario, ids, random.Random(0)))  # warm up
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.perf_counter()
+        results = [r for rs in pool.map(worker, range(concurrency)) for r in rs]
+        elapsed = time.perf_counter() - start
+
+    report = latency_report([ms for ms, _, _ in results], elapsed)
+    queries = [q for _, _, q in results if q is not None]
+    if queries:
+        report["queries_mean"] = round(sum(queries) / len(queries), 2)
+        report["queries_max"] = max(queries)
+    report["statuses"] = {
+        str(code): count
+        for code, count in sorted(Counter(r[1] for r in results).items())
+    }
+    return report
+
+
+def start_server(mode, database_name, workers, overrides):
+    """
+    Start ``manage.py serve`` on the test database with the settings in
+    ``overrides`` passed as environment variables, and wait until it listens.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    env = dict(
+        os.environ,
+        DB_NAME=database_name,
+        **{name: str(value) for name, value in overrides.items()},
+    )
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "manage.py",
+            "serve",
+            "--mode",
+            mode,
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(workers),
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"manage.py serve exited with {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("manage.py serve did not start listening within 30 seconds")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="Dataset multiplier.")
+    parser.add_argument("--requests", type=int, default=200, help="Per endpoint.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--server",
+        choices=("wsgi", "asgi"),
+        help="Send requests over HTTP to `manage.py serve --mode ...` instead "
+        "of through the WSGI handler in process.",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Server workers.")
+    parser.add_argument(
+        "--only", help="Run just the scenarios whose name starts with this."
+    )
+    parser.add_argument(
+        "--response-cache",
+        action="store_true",
+        help="Turn the response cache on (RESPONSE_CACHE_TIMEOUT=300); with "
+        "--server and several workers it needs REDIS_URL.",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args()
+
+    # Query counts come from the Server-Timing header, in process and from
+    # the server, which inherits the environment.
+    os.environ["REQUEST_METRICS"] = "1"
+    setup_django()
+    from django.test import override_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from api.models import UserModel
+
+    scenarios = [s for s in SCENARIOS if not args.only or s[0].startswith(args.only)]
+    dataset = {
+        "users": 200 * args.scale,
+        "projects": 100 * args.scale,
+        "tasks": 5000 * args.scale,
+        "comments": 10000 * args.scale,
+        "documents": 1000 * args.scale,
+        "timeline": 20000 * args.scale,
+        "notifications": 20000 * args.scale,
+    }
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "driver": f"http-{args.server}" if args.server else "in-process-wsgi",
+            "requests_per_endpoint": args.requests,
+            "concurrency": args.concurrency,
+            "response_cache": args.response_cache,
+            "dataset": dataset,
+        },
+        "endpoints": {},
+    }
+
+    media = tempfile.TemporaryDirectory(prefix="benchmarks-load-")
+    overrides = {
+        "RESPONSE_CACHE_TIMEOUT": 300 if args.response_cache else 0,
+        # Uploaded documents are written here, not to the project's media/.
+        "MEDIA_ROOT": media.name,
+    }
+    with media, test_database() as connection, override_settings(**overrides):
+        seed_dataset(**dataset)
+        manager = UserModel.objects.order_by("id").first()
+        ids = seeded_ids(manager)
+        token = str(AccessToken.for_user(manager))
+        connection.close()
+
+        server = None
+        if args.server:
+            server, port = start_server(
+                args.server, connection.settings_dict["NAME"], args.workers, overrides
+            )
+            send = http_sender(token, "127.0.0.1", port)
+        else:
+            send = in_process_sender(token)
+        try:
+            for scenario in scenarios:
+                result = run_scenario(
+                    send, scenario, ids, args.requests, args.concurrency
+                )
+                report["endpoints"][scenario[0]] = result
+                print(f"-- {scenario[0]}: {result}")
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare DRF's ``JSONRenderer``/``JSONParser`` with the orjson-backed
+``FastJSONRenderer``/``FastJSONParser`` on a serialized ``TaskSerializer``
+payload. Needs no database; the tasks are built in memory::
+
+    python -m benchmarks.renderers --rows 10000
+"""
+
+import argparse
+import io
+import json
+
+from .common import measure, setup_django
+
+
+def task_payload(rows):
+    from api.models import Task
+    from api.serializers import TaskSerializer
+
+    tasks = [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            description="Seeded task with a longer description " * 3,
+            status="open",
+            project_id=i % 100,
+            assignee_id=i % 200,
+        )
+        for i in range(rows)
+    ]
+    return {"status_code": 200, "tasks": TaskSerializer(tasks, many=True).data}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import FastJSONParser
+    from api.renderers import FastJSONRenderer
+
+    data = task_payload(args.rows)
+    body = JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data) == body
+
+    report = {
+        "render": {
+            "json": measure(lambda: JSONRenderer().render(data), args.repeat),
+            "fast_json": measure(lambda: FastJSONRenderer().render(data), args.repeat),
+        },
+        "parse": {
+            "json": measure(lambda: JSONParser().parse(io.BytesIO(body)), args.repeat),
+            "fast_json": measure(
+                lambda: FastJSONParser().parse(io.BytesIO(body)), args.repeat
+            ),
+        },
+    }
+    print(f"payload: {args.rows} rows, {len(body)} bytes")
+    for name, results in report.items():
+        for label, timing in results.items():
+            print(f"-- {name} {label}: {timing}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()